@@ -0,0 +1,33 @@
+"""Add events (event_type, created_at) index
+
+Revision ID: 3b7e2f9c1d4a
+Revises: 668a1a58feab
+Create Date: 2026-10-17 09:12:41.208533
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e2f9c1d4a"
+down_revision: Union[str, Sequence[str], None] = "668a1a58feab"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_events_type_created_at",
+        "events",
+        ["event_type", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_events_type_created_at", table_name="events")
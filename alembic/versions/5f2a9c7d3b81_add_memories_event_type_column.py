@@ -0,0 +1,46 @@
+"""Add indexed memories.event_type column
+
+Revision ID: 5f2a9c7d3b81
+Revises: 8d4c1e6a2f70
+Create Date: 2026-10-17 15:04:27.481902
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5f2a9c7d3b81"
+down_revision: Union[str, Sequence[str], None] = "8d4c1e6a2f70"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "memories", sa.Column("event_type", sa.String(length=100), nullable=True)
+    )
+
+    # Backfill from the event type recorded in each memory's content
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("UPDATE memories SET event_type = content->>'event_type'")
+    else:
+        op.execute(
+            "UPDATE memories SET event_type = json_extract(content, '$.event_type')"
+        )
+
+    op.create_index(
+        "ix_memories_event_type_created_at",
+        "memories",
+        ["event_type", "created_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_memories_event_type_created_at", table_name="memories")
+    op.drop_column("memories", "event_type")
@@ -0,0 +1,35 @@
+"""Replace events created_at index with (created_at, id)
+
+Revision ID: 8d4c1e6a2f70
+Revises: 3b7e2f9c1d4a
+Create Date: 2026-10-17 11:38:05.614270
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d4c1e6a2f70"
+down_revision: Union[str, Sequence[str], None] = "3b7e2f9c1d4a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_events_created_at_id",
+        "events",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.drop_index("ix_events_created_at", table_name="events")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_events_created_at", "events", ["created_at"], unique=False)
+    op.drop_index("ix_events_created_at_id", table_name="events")
@@ -4,7 +4,7 @@
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_async_session
+from ..database import AnalyticsSessionLocal, get_async_session
 from ..models.consciousness import ConsciousnessSession
 from .decision_engine import DecisionMakingEngine
 from .emotion_processor import EmotionProcessor
@@ -61,9 +61,12 @@ async def initialize(self):
                 self.emotion_processor = EmotionProcessor(session)
                 self.memory_manager = MemoryManager(session)
                 self.decision_engine = DecisionMakingEngine(session)
-                self.learning_engine = LearningEngine(session)
+                self.learning_engine = LearningEngine(session, AnalyticsSessionLocal)
+                await self.learning_engine.start_memory_writer(AnalyticsSessionLocal)
                 self.query_engine = QueryEngine(session)
-                self.prediction_engine = PredictionEngine(session)
+                self.prediction_engine = PredictionEngine(
+                    session, AnalyticsSessionLocal
+                )
 
                 # Load initial state
                 await self._load_initial_state(session)
@@ -98,6 +101,10 @@ async def stop(self):
         """Stop the consciousness engine gracefully."""
         self.is_active = False
 
+        # Write any learning memories still queued before shutting down
+        if self.learning_engine is not None:
+            await self.learning_engine.stop_memory_writer()
+
         async with get_async_session() as session:
             await self._finalize_session(session)
 
@@ -1,53 +1,440 @@
 import asyncio
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from statistics import fmean
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
-from sqlalchemy import and_, func, or_, select, update
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    and_,
+    bindparam,
+    case,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from ..models.consciousness import EmotionalState, Experience, Memory
 from ..models.entities import Device
 from ..models.events import ControlAction, Event
 from ..repositories.consciousness import EmotionalStateRepository, MemoryRepository
 
+logger = logging.getLogger(__name__)
+
+# Columns ExperienceBatch reads from each experience, fetched by one C call
+_EXPERIENCE_FIELDS = attrgetter(
+    "outcome", "impact_score", "created_at", "experience_type", "context"
+)
+
+# Columns the efficiency analysis reads from each control action
+_ACTION_FIELDS = attrgetter("status", "created_at", "executed_at")
+
+
+@dataclass
+class ExperienceBatch:
+    """Column-oriented view of experiences, built once per learning cycle."""
+
+    rows: List[Any]  # Experience instances or column rows
+    outcomes: List[str]
+    positive: np.ndarray  # bool, outcome == "positive"
+    impacts: np.ndarray  # float64 impact scores
+    hours: np.ndarray  # int64 hour of creation
+    types: List[str]
+    contexts: List[Dict[str, Any]]
+
+    @classmethod
+    def from_experiences(cls, experiences: List[Any]) -> "ExperienceBatch":
+        """Extract every column the analyzers read in one attrgetter pass."""
+        rows = list(experiences)
+        n = len(rows)
+        outcomes, impacts, created, types, contexts = (
+            zip(*map(_EXPERIENCE_FIELDS, rows)) if rows else ((),) * 5
+        )
+        return cls(
+            rows=rows,
+            outcomes=list(outcomes),
+            positive=np.fromiter(
+                (outcome == "positive" for outcome in outcomes),
+                dtype=np.bool_,
+                count=n,
+            ),
+            impacts=np.fromiter(impacts, dtype=np.float64, count=n),
+            hours=np.fromiter(
+                (created_at.hour for created_at in created), dtype=np.int64, count=n
+            ),
+            types=list(types),
+            contexts=[context or {} for context in contexts],
+        )
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def take(self, indices: List[int]) -> "ExperienceBatch":
+        """Return the sub-batch at the given row indices."""
+        return ExperienceBatch(
+            rows=[self.rows[i] for i in indices],
+            outcomes=[self.outcomes[i] for i in indices],
+            positive=self.positive[indices],
+            impacts=self.impacts[indices],
+            hours=self.hours[indices],
+            types=[self.types[i] for i in indices],
+            contexts=[self.contexts[i] for i in indices],
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PreventionStrategy:
+    """An error prevention strategy for one potential cause."""
+
+    type: str
+    description: str
+    implementation: str
+
+
+@dataclass(frozen=True)
+class LearningType:
+    """Configuration for one kind of learning."""
+
+    description: str
+    weight: float
+    confidence_threshold: float
+
+
+LEARNING_TYPES = {
+    "pattern_recognition": LearningType(
+        description="Learning patterns from sensor data and user behavior",
+        weight=0.3,
+        confidence_threshold=0.7,
+    ),
+    "behavior_adaptation": LearningType(
+        description="Adapting behavior based on outcomes and feedback",
+        weight=0.25,
+        confidence_threshold=0.8,
+    ),
+    "efficiency_optimization": LearningType(
+        description="Optimizing system efficiency and performance",
+        weight=0.2,
+        confidence_threshold=0.75,
+    ),
+    "user_preference_learning": LearningType(
+        description="Learning user preferences and habits",
+        weight=0.15,
+        confidence_threshold=0.9,
+    ),
+    "error_correction": LearningType(
+        description="Learning from errors and failures",
+        weight=0.1,
+        confidence_threshold=0.6,
+    ),
+}
+
+
+def _mean_var(values: np.ndarray) -> Tuple[float, float]:
+    """Return the mean and population variance, reusing the one mean pass."""
+    mean = values.mean()
+    deviations = values - mean
+    return mean, deviations.dot(deviations) / values.size
+
+
+# Weight of each learning opportunity factor in the overall score
+_OPPORTUNITY_WEIGHTS = {
+    "novelty_score": 0.3,
+    "complexity_score": 0.2,
+    "uncertainty_score": 0.3,
+    "potential_impact": 0.2,
+}
+_OPPORTUNITY_WEIGHT_VECTOR = np.fromiter(
+    _OPPORTUNITY_WEIGHTS.values(), dtype=np.float64
+)
+
+
+# Potential impact of a context by its priority
+_PRIORITY_IMPACT = {"high": 0.9, "medium": 0.6, "low": 0.3}
+
+# Error prevention (priority, confidence) by error severity
+_SEVERITY_PREVENTION = {"critical": ("high", 0.8), "high": ("medium", 0.7)}
+
+# Error prevention strategy for each potential cause
+_PREVENTION_STRATEGIES = {
+    "device_malfunction": PreventionStrategy(
+        type="device_monitoring",
+        description="Implement enhanced device health monitoring",
+        implementation="Add device status checks before critical operations",
+    ),
+    "connectivity_issue": PreventionStrategy(
+        type="connectivity_resilience",
+        description="Improve network connectivity resilience",
+        implementation="Add connection retry logic and offline mode fallbacks",
+    ),
+    "system_overload": PreventionStrategy(
+        type="load_management",
+        description="Implement better system load management",
+        implementation="Add request queuing and rate limiting",
+    ),
+}
+
+
+# Potential error cause for each phrase found in an event type
+_EVENT_TYPE_CAUSES = {"network": "connectivity_issue"}
+_EVENT_TYPE_CAUSE_PATTERN = re.compile(
+    "|".join(map(re.escape, _EVENT_TYPE_CAUSES)), re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=1024)
+def _event_type_causes(event_type: str) -> Tuple[str, ...]:
+    """Return the potential causes named by an event type, in match order.
+
+    One pass of a compiled alternation covers every phrase, however many
+    causes the table grows to.
+    """
+    return tuple(
+        dict.fromkeys(
+            _EVENT_TYPE_CAUSES[match.group().lower()]
+            for match in _EVENT_TYPE_CAUSE_PATTERN.finditer(event_type)
+        )
+    )
+
+
+@lru_cache(maxsize=4096)
+def _classify_learning_type(event_type: str, source: str, outcome: str) -> str:
+    """Classify a learning opportunity from its event type, source and outcome.
+
+    Pure in its three string fields, so repeated experience kinds hit the cache.
+    """
+
+    # Determine learning type based on experience characteristics
+    if "pattern" in event_type.lower():
+        return "pattern_recognition"
+    elif "user" in source.lower():
+        return "user_preference_learning"
+    elif "error" in outcome or "failure" in outcome:
+        return "error_correction"
+    elif "efficiency" in event_type:
+        return "efficiency_optimization"
+    else:
+        return "behavior_adaptation"
+
+
+def _tagged_union(model: Any, **queries: Any):
+    """Combine id queries over one table into a single tagged UNION ALL.
+
+    Each query selects ``model.id``; the statement returns ``(row, tag)``
+    pairs tagged with the keyword each query was passed under, newest first.
+    """
+    tagged = union_all(
+        *(
+            select(query.subquery().c.id, literal(tag).label("corpus"))
+            for tag, query in queries.items()
+        )
+    ).subquery("tagged")
+
+    return (
+        select(model, tagged.c.corpus)
+        .join(tagged, model.id == tagged.c.id)
+        .order_by(model.created_at.desc())
+    )
+
+
+# Learning corpus statements are built once; each cycle only binds cutoffs
+_RECENT_ACTIVITY_STMT = select(
+    exists()
+    .where(Experience.created_at >= bindparam("experience_cutoff"))
+    .label("experiences"),
+    exists().where(Event.created_at >= bindparam("event_cutoff")).label("events"),
+    exists()
+    .where(ControlAction.executed_at >= bindparam("action_cutoff"))
+    .label("control_actions"),
+)
+
+# Newest positive experiences, sized by (type, device type) bucket in the
+# database. These buckets are never finer than the pattern keys built in
+# _group_experiences_by_pattern, so dropping rows whose bucket is below the
+# learning minimum never loses a learnable pattern.
+_RECENT_POSITIVE = (
+    select(
+        Experience.id,
+        Experience.experience_type,
+        Experience.context["device_type"].as_string().label("device_type"),
+    )
+    .where(
+        and_(
+            Experience.created_at >= bindparam("cutoff"),
+            Experience.outcome == "positive",
+        )
+    )
+    .order_by(Experience.created_at.desc())
+    .limit(100)
+    .subquery("recent_positive")
+)
+
+_PATTERN_BUCKETS = select(
+    _RECENT_POSITIVE.c.id,
+    func.count()
+    .over(
+        partition_by=(
+            _RECENT_POSITIVE.c.experience_type,
+            _RECENT_POSITIVE.c.device_type,
+        )
+    )
+    .label("bucket_size"),
+).subquery("pattern_buckets")
+
+# Only the experience columns the pattern learners read, as plain rows
+_EXPERIENCE_COLUMNS = (
+    Experience.id,
+    Experience.experience_type,
+    Experience.outcome,
+    Experience.impact_score,
+    Experience.context,
+    Experience.created_at,
+)
+
+_POSITIVE_EXPERIENCES_STMT = (
+    select(*_EXPERIENCE_COLUMNS)
+    .join(_PATTERN_BUCKETS, Experience.id == _PATTERN_BUCKETS.c.id)
+    .where(_PATTERN_BUCKETS.c.bucket_size >= bindparam("min_bucket_size"))
+    .order_by(Experience.created_at.desc())
+)
+
+# Outcome aggregate per behavior context (falling back to the experience
+# type) over the newest 100 experiences in the window
+_RECENT_OUTCOMES = (
+    select(
+        func.coalesce(
+            Experience.context["behavior_context"].as_string(),
+            Experience.experience_type,
+        ).label("behavior_context"),
+        Experience.outcome,
+        Experience.impact_score,
+    )
+    .where(Experience.created_at >= bindparam("cutoff"))
+    .order_by(Experience.created_at.desc())
+    .limit(100)
+    .subquery("recent_outcomes")
+)
+
+_OUTCOME_STATS_STMT = (
+    select(
+        _RECENT_OUTCOMES.c.behavior_context,
+        func.count().label("total_outcomes"),
+        func.sum(case((_RECENT_OUTCOMES.c.outcome == "positive", 1), else_=0)).label(
+            "positive_outcomes"
+        ),
+        func.avg(_RECENT_OUTCOMES.c.impact_score).label("average_impact"),
+    )
+    .group_by(_RECENT_OUTCOMES.c.behavior_context)
+    .having(func.count() >= 2)
+)
+
+_USER_INTERACTION_IDS = (
+    select(Event.id)
+    .where(
+        and_(
+            Event.event_type == "user_query",
+            Event.created_at >= bindparam("interaction_cutoff"),
+        )
+    )
+    .order_by(Event.created_at.desc())
+    .limit(100)
+)
+
+_ERROR_EVENT_IDS = (
+    select(Event.id)
+    .where(
+        and_(
+            Event.severity.in_(["high", "critical"]),
+            Event.created_at >= bindparam("error_cutoff"),
+        )
+    )
+    .order_by(Event.created_at.desc())
+    .limit(50)
+)
+
+_LEARNING_EVENTS_STMT = _tagged_union(
+    Event, user_interactions=_USER_INTERACTION_IDS, error_events=_ERROR_EVENT_IDS
+)
+
+# Earliest events within a window around an error, excluding the error itself
+_RELATED_EVENTS_STMT = (
+    select(Event.event_type, Event.severity, Event.created_at)
+    .where(
+        and_(
+            Event.created_at.between(
+                bindparam("window_start"), bindparam("window_end")
+            ),
+            Event.id != bindparam("error_id"),
+        )
+    )
+    .order_by(Event.created_at, Event.id)
+    .limit(10)
+)
+
+# How many events share that window, counting no further than the overload
+# threshold needs
+_RELATED_EVENT_COUNT_STMT = select(func.count()).select_from(
+    _RELATED_EVENTS_STMT.with_only_columns(Event.id).order_by(None).limit(4).subquery()
+)
+
+_CONTROL_ACTIONS_STMT = (
+    select(
+        ControlAction.device_id,
+        ControlAction.action_type,
+        ControlAction.status,
+        ControlAction.created_at,
+        ControlAction.executed_at,
+    )
+    .where(ControlAction.executed_at >= bindparam("cutoff"))
+    .order_by(ControlAction.executed_at.desc())
+    .limit(200)
+)
+
 
 class LearningEngine:
     """Manages learning, adaptation, and behavioral improvement through experience."""
 
-    def __init__(self, session: AsyncSession):
+    # Time-of-day period for each hour 0-23
+    _HOUR_BUCKETS = (
+        ("night",) * 6
+        + ("morning",) * 6
+        + ("afternoon",) * 6
+        + ("evening",) * 4
+        + ("night",) * 2
+    )
+
+    # Pattern key builder by (has device_type, has time_of_day) context keys
+    _PATTERN_KEY_FORMATS = {
+        (False, False): "{0}_{1}".format,
+        (True, False): "{0}_{1}_{2}".format,
+        (False, True): "{0}_{1}_{3}".format,
+        (True, True): "{0}_{1}_{2}_{3}".format,
+    }
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        sessionmaker: Optional[async_sessionmaker] = None,
+    ):
         self.session = session
+        # Optional factory for read-only corpus queries run on their own
+        # connections; without it they share ``session`` one at a time
+        self.sessionmaker = sessionmaker
         self.memory_repo = MemoryRepository(session)
         self.emotion_repo = EmotionalStateRepository(session)
 
         # Learning configuration
-        self.learning_types = {
-            "pattern_recognition": {
-                "description": "Learning patterns from sensor data and user behavior",
-                "weight": 0.3,
-                "confidence_threshold": 0.7,
-            },
-            "behavior_adaptation": {
-                "description": "Adapting behavior based on outcomes and feedback",
-                "weight": 0.25,
-                "confidence_threshold": 0.8,
-            },
-            "efficiency_optimization": {
-                "description": "Optimizing system efficiency and performance",
-                "weight": 0.2,
-                "confidence_threshold": 0.75,
-            },
-            "user_preference_learning": {
-                "description": "Learning user preferences and habits",
-                "weight": 0.15,
-                "confidence_threshold": 0.9,
-            },
-            "error_correction": {
-                "description": "Learning from errors and failures",
-                "weight": 0.1,
-                "confidence_threshold": 0.6,
-            },
-        }
+        self.learning_types = LEARNING_TYPES
 
         # Learning parameters
         self.min_experiences_for_learning = 3
@@ -55,6 +442,26 @@ def __init__(self, session: AsyncSession):
         self.confidence_decay_rate = 0.05
         self.max_learning_updates_per_cycle = 10
 
+        # Most read-only queries a cycle runs at once on ``sessionmaker``
+        self.max_concurrent_reads = 8
+
+        # Seconds to reuse the recent-activity probe between cycles
+        self.activity_check_ttl = 30.0
+        self._activity_cache: Optional[Tuple[float, Dict[str, bool]]] = None
+
+        # Learning memories queued during a cycle, inserted together
+        self._pending_memories: List[Memory] = []
+
+        # Background writer for learning memories, started by the engine
+        self.memory_batch_size = 64
+        self.memory_flush_interval = 0.5
+        self._memory_queue: Optional[asyncio.Queue] = None
+        self._memory_writer_task: Optional[asyncio.Task] = None
+
+        # Timestamp shared by every cutoff and date stamp in one cycle
+        self._cycle_now: Optional[datetime] = None
+        self._cycle_now_iso: Optional[str] = None
+
         # Performance tracking
         self.performance_metrics = {
             "successful_predictions": 0,
@@ -67,36 +474,56 @@ def __init__(self, session: AsyncSession):
     async def process_learning_updates(self) -> int:
         """Process all pending learning updates and adaptations."""
 
-        learning_updates = 0
+        self._cycle_now = datetime.utcnow()
+        self._cycle_now_iso = self._cycle_now.isoformat()
+        try:
+            learning_updates = 0
+
+            # Load everything this cycle learns from up front
+            corpus = await self._fetch_learning_corpus()
 
-        # Pattern recognition learning
-        pattern_updates = await self._learn_patterns()
-        learning_updates += pattern_updates
+            # Pattern recognition learning
+            pattern_updates = self._learn_patterns(corpus["positive_experiences"])
+            learning_updates += pattern_updates
 
-        # Behavior adaptation learning
-        behavior_updates = await self._adapt_behaviors()
-        learning_updates += behavior_updates
+            # Behavior adaptation learning
+            behavior_updates = self._adapt_behaviors(corpus["outcome_stats"])
+            learning_updates += behavior_updates
 
-        # Efficiency optimization learning
-        efficiency_updates = await self._optimize_efficiency()
-        learning_updates += efficiency_updates
+            # Efficiency optimization learning
+            efficiency_updates = self._optimize_efficiency(corpus["control_actions"])
+            learning_updates += efficiency_updates
 
-        # User preference learning
-        preference_updates = await self._learn_user_preferences()
-        learning_updates += preference_updates
+            # User preference learning
+            preference_updates = self._learn_user_preferences(
+                corpus["user_interactions"]
+            )
+            learning_updates += preference_updates
 
-        # Error correction learning
-        error_updates = await self._learn_from_errors()
-        learning_updates += error_updates
+            # Error correction learning
+            error_updates = await self._learn_from_errors(corpus["error_events"])
+            learning_updates += error_updates
 
-        # Update learning performance metrics
-        await self._update_learning_metrics()
+            # One metrics snapshot serves the cycle summary and the metrics event
+            metrics = dict(self.performance_metrics)
 
-        # Store learning insights as memories
-        if learning_updates > 0:
-            await self._store_learning_insights(learning_updates)
+            # Store learning insights as memories
+            if learning_updates > 0:
+                self._store_learning_insights(learning_updates, metrics)
 
-        return learning_updates
+            # Insert the memories queued this cycle in one batch
+            await self._flush_pending_memories()
+
+            # Update learning performance metrics
+            self._queue_metrics_update(metrics)
+
+            # Persist the whole cycle with a single commit
+            await self.session.commit()
+
+            return learning_updates
+        finally:
+            self._cycle_now = None
+            self._cycle_now_iso = None
 
     async def learn_from_experience(
         self,
@@ -118,29 +545,27 @@ async def learn_from_experience(
         learning_type = self._classify_learning_opportunity(experience_data, outcome)
 
         # Extract learning insights
-        insights = await self._extract_learning_insights(
+        insights = self._extract_learning_insights(
             experience_data, outcome, emotional_state
         )
         learning_result["insights_gained"] = insights
 
         # Update behavior patterns
-        behavior_updates = await self._update_behavior_patterns(
+        behavior_updates = self._update_behavior_patterns(
             experience_data, outcome, insights
         )
         learning_result["behaviors_adapted"] = behavior_updates
 
         # Discover new patterns
-        patterns = await self._discover_patterns(experience_data, outcome)
+        patterns = self._discover_patterns(experience_data, outcome)
         learning_result["patterns_discovered"] = patterns
 
         # Update confidence levels
-        confidence_updates = await self._update_confidence_levels(
-            experience_data, outcome
-        )
+        confidence_updates = self._update_confidence_levels(experience_data, outcome)
         learning_result["confidence_updates"] = confidence_updates
 
         # Generate recommendations
-        recommendations = await self._generate_learning_recommendations(learning_result)
+        recommendations = self._generate_learning_recommendations(learning_result)
         learning_result["recommendations"] = recommendations
 
         # Store as learning memory
@@ -181,351 +606,397 @@ async def predict_learning_opportunity(
     ) -> Dict[str, Any]:
         """Predict potential learning opportunities based on current context."""
 
+        # Analyze current context for learning potential
+        context_analysis = self._analyze_context_for_learning(context)
+
+        # Calculate opportunity score
+        opportunity_score = self._calculate_learning_opportunity_score(context_analysis)
+
+        return self._build_opportunity_prediction(context_analysis, opportunity_score)
+
+    async def predict_learning_opportunities(
+        self, contexts: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Predict learning opportunities for several contexts at once."""
+
+        context_analyses = [
+            self._analyze_context_for_learning(context) for context in contexts
+        ]
+        opportunity_scores = self._score_opportunities_batch(context_analyses)
+
+        return [
+            self._build_opportunity_prediction(context_analysis, float(score))
+            for context_analysis, score in zip(context_analyses, opportunity_scores)
+        ]
+
+    def _build_opportunity_prediction(
+        self, context_analysis: Dict[str, Any], opportunity_score: float
+    ) -> Dict[str, Any]:
+        """Build the opportunity prediction for one scored context analysis."""
+
         prediction = {
-            "opportunity_score": 0.0,
+            "opportunity_score": opportunity_score,
             "learning_type": None,
             "potential_insights": [],
             "recommended_actions": [],
             "confidence": 0.0,
         }
 
-        # Analyze current context for learning potential
-        context_analysis = await self._analyze_context_for_learning(context)
-
-        # Calculate opportunity score
-        opportunity_score = await self._calculate_learning_opportunity_score(
-            context_analysis
-        )
-        prediction["opportunity_score"] = opportunity_score
-
         # Determine learning type
         if opportunity_score > 0.7:
-            learning_type = await self._identify_primary_learning_type(context_analysis)
+            learning_type = self._identify_primary_learning_type(context_analysis)
             prediction["learning_type"] = learning_type
 
             # Generate potential insights
-            insights = await self._predict_potential_insights(
-                context_analysis, learning_type
-            )
+            insights = self._predict_potential_insights(context_analysis, learning_type)
             prediction["potential_insights"] = insights
 
             # Recommend actions
-            actions = await self._recommend_learning_actions(
-                context_analysis, learning_type
-            )
+            actions = self._recommend_learning_actions(context_analysis, learning_type)
             prediction["recommended_actions"] = actions
 
             prediction["confidence"] = min(0.9, opportunity_score * 1.2)
 
         return prediction
 
-    async def _learn_patterns(self) -> int:
-        """Learn patterns from recent experiences and sensor data."""
+    def _learn_patterns(self, recent_experiences: ExperienceBatch) -> int:
+        """Learn patterns from recent experiences with positive outcomes."""
 
         pattern_updates = 0
+        min_experiences = self.min_experiences_for_learning
+        threshold = self.learning_types["pattern_recognition"].confidence_threshold
 
-        # Get recent experiences with positive outcomes
-        recent_experiences = await self._get_recent_experiences(
-            outcome_filter="positive", days=7
-        )
-
-        if len(recent_experiences) < self.min_experiences_for_learning:
+        if len(recent_experiences) < min_experiences:
             return 0
 
         # Group experiences by type and context
         experience_groups = self._group_experiences_by_pattern(recent_experiences)
 
-        for pattern_type, experiences in experience_groups.items():
-            if len(experiences) >= self.min_experiences_for_learning:
+        for pattern_type, indices in experience_groups.items():
+            if len(indices) >= min_experiences:
                 # Discover pattern
-                pattern = await self._analyze_experience_pattern(experiences)
+                experiences = recent_experiences.take(indices)
+                pattern = self._analyze_experience_pattern(experiences)
 
-                if (
-                    pattern["confidence"]
-                    > self.learning_types["pattern_recognition"]["confidence_threshold"]
-                ):
+                if pattern["confidence"] > threshold:
                     # Store pattern as learning memory
-                    await self._store_pattern_memory(pattern_type, pattern, experiences)
+                    self._store_pattern_memory(pattern_type, pattern, experiences.rows)
                     pattern_updates += 1
-                    self.performance_metrics["pattern_discoveries"] += 1
 
+        self.performance_metrics["pattern_discoveries"] += pattern_updates
         return pattern_updates
 
-    async def _adapt_behaviors(self) -> int:
+    def _adapt_behaviors(self, outcome_stats: List[Any]) -> int:
         """Adapt behaviors based on recent feedback and outcomes."""
 
         behavior_updates = 0
-
-        # Get recent experiences with clear outcomes
-        recent_experiences = await self._get_recent_experiences(days=3)
+        min_experiences = self.min_experiences_for_learning
+        threshold = self.learning_types["behavior_adaptation"].confidence_threshold
 
         # Analyze outcome patterns
-        outcome_analysis = await self._analyze_outcome_patterns(recent_experiences)
+        outcome_analysis = self._analyze_outcome_patterns(outcome_stats)
 
         for behavior_context, analysis in outcome_analysis.items():
-            if analysis["sample_size"] >= self.min_experiences_for_learning:
+            if analysis["sample_size"] >= min_experiences:
                 # Calculate success rate
                 success_rate = (
                     analysis["positive_outcomes"] / analysis["total_outcomes"]
                 )
 
                 if success_rate < 0.6:  # Poor performance, adapt behavior
-                    adaptation = await self._generate_behavior_adaptation(
+                    adaptation = self._generate_behavior_adaptation(
                         behavior_context, analysis
                     )
 
-                    if (
-                        adaptation["confidence"]
-                        > self.learning_types["behavior_adaptation"][
-                            "confidence_threshold"
-                        ]
-                    ):
+                    if adaptation["confidence"] > threshold:
                         # Store adaptation as learning memory
-                        await self._store_adaptation_memory(
+                        self._store_adaptation_memory(
                             behavior_context, adaptation, analysis
                         )
                         behavior_updates += 1
-                        self.performance_metrics["behavior_improvements"] += 1
 
+        self.performance_metrics["behavior_improvements"] += behavior_updates
         return behavior_updates
 
-    async def _optimize_efficiency(self) -> int:
-        """Learn efficiency optimizations from system performance data."""
+    def _optimize_efficiency(self, recent_actions: List[ControlAction]) -> int:
+        """Learn efficiency optimizations from recent control actions."""
 
         efficiency_updates = 0
+        min_experiences = self.min_experiences_for_learning
+        threshold = self.learning_types["efficiency_optimization"].confidence_threshold
 
-        # Analyze recent control actions and their efficiency
-        recent_actions = await self._get_recent_control_actions(days=7)
-
-        if len(recent_actions) < self.min_experiences_for_learning:
+        if len(recent_actions) < min_experiences:
             return 0
 
         # Group actions by device and action type
         action_groups = self._group_control_actions(recent_actions)
 
         for group_key, actions in action_groups.items():
-            if len(actions) >= self.min_experiences_for_learning:
+            if len(actions) >= min_experiences:
                 # Analyze efficiency metrics
-                efficiency_analysis = await self._analyze_action_efficiency(actions)
+                efficiency_analysis = self._analyze_action_efficiency(actions)
 
                 if efficiency_analysis["improvement_potential"] > 0.2:
                     # Generate efficiency optimization
-                    optimization = await self._generate_efficiency_optimization(
+                    optimization = self._generate_efficiency_optimization(
                         group_key, efficiency_analysis
                     )
 
-                    if (
-                        optimization["confidence"]
-                        > self.learning_types["efficiency_optimization"][
-                            "confidence_threshold"
-                        ]
-                    ):
+                    if optimization["confidence"] > threshold:
                         # Store optimization as learning memory
-                        await self._store_efficiency_memory(
+                        self._store_efficiency_memory(
                             group_key, optimization, efficiency_analysis
                         )
                         efficiency_updates += 1
-                        self.performance_metrics["efficiency_gains"] += 1
 
+        self.performance_metrics["efficiency_gains"] += efficiency_updates
         return efficiency_updates
 
-    async def _learn_user_preferences(self) -> int:
+    def _learn_user_preferences(self, user_interactions: List[Event]) -> int:
         """Learn user preferences from interaction patterns."""
 
         preference_updates = 0
-
-        # Get recent user interactions
-        user_interactions = await self._get_recent_user_interactions(days=14)
+        threshold = self.learning_types["user_preference_learning"].confidence_threshold
 
         if len(user_interactions) < self.min_experiences_for_learning:
             return 0
 
         # Analyze preference patterns
-        preference_patterns = await self._analyze_preference_patterns(user_interactions)
+        preference_patterns = self._analyze_preference_patterns(user_interactions)
 
         for preference_type, pattern in preference_patterns.items():
-            if (
-                pattern["confidence"]
-                > self.learning_types["user_preference_learning"][
-                    "confidence_threshold"
-                ]
-            ):
+            if pattern["confidence"] > threshold:
                 # Store preference as learning memory
-                await self._store_preference_memory(preference_type, pattern)
+                self._store_preference_memory(preference_type, pattern)
                 preference_updates += 1
 
         return preference_updates
 
-    async def _learn_from_errors(self) -> int:
-        """Learn from errors and system failures."""
+    async def _learn_from_errors(self, error_events: List[Event]) -> int:
+        """Learn from recent errors and system failures."""
 
         error_updates = 0
+        threshold = self.learning_types["error_correction"].confidence_threshold
 
-        # Get recent error events
-        error_events = await self._get_recent_error_events(days=7)
+        # Analyze error context and causes
+        if self.sessionmaker is not None:
+            # Each analysis reads on its own session, so overlap them
+            semaphore = asyncio.Semaphore(self.max_concurrent_reads)
 
-        for error_event in error_events:
-            # Analyze error context and causes
-            error_analysis = await self._analyze_error_context(error_event)
+            async def analyze(error_event: Event) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self._analyze_error_context(error_event)
 
+            error_analyses = await asyncio.gather(*map(analyze, error_events))
+        else:
+            error_analyses = [
+                await self._analyze_error_context(error_event)
+                for error_event in error_events
+            ]
+
+        for error_event, error_analysis in zip(error_events, error_analyses):
             # Generate error prevention strategy
-            prevention_strategy = await self._generate_error_prevention(error_analysis)
+            prevention_strategy = self._generate_error_prevention(error_analysis)
 
-            if (
-                prevention_strategy["confidence"]
-                > self.learning_types["error_correction"]["confidence_threshold"]
-            ):
+            if prevention_strategy["confidence"] > threshold:
                 # Store error learning as memory
-                await self._store_error_learning_memory(
+                self._store_error_learning_memory(
                     error_event, error_analysis, prevention_strategy
                 )
                 error_updates += 1
 
         return error_updates
 
-    async def _get_recent_experiences(
-        self, outcome_filter: str = None, days: int = 7
-    ) -> List[Experience]:
-        """Get recent experiences, optionally filtered by outcome."""
+    def _now(self) -> datetime:
+        """Return the current cycle's timestamp, or the clock outside a cycle."""
+        return self._cycle_now or datetime.utcnow()
 
-        cutoff_time = datetime.utcnow() - timedelta(days=days)
-        query = select(Experience).where(Experience.created_at >= cutoff_time)
+    def _now_iso(self) -> str:
+        """Return ``_now()`` in ISO format, formatted once per cycle."""
+        return self._cycle_now_iso or datetime.utcnow().isoformat()
 
-        if outcome_filter:
-            query = query.where(Experience.outcome == outcome_filter)
+    async def _fetch_learning_corpus(self) -> Dict[str, Any]:
+        """Load the experiences, actions and events for one learning cycle.
 
-        result = await self.session.execute(
-            query.order_by(Experience.created_at.desc()).limit(100)
-        )
-        return result.scalars().all()
+        The statements are prebuilt at import time, so each cycle only binds
+        its cutoffs. Both event windows share one tagged UNION ALL and
+        outcome rates are aggregated in the database, so the cycle needs
+        four round-trips instead of five. Experiences and control actions
+        are loaded as plain column rows rather than ORM instances, and
+        experiences are returned as ExperienceBatch columns.
 
-    async def _get_recent_control_actions(self, days: int = 7) -> List[ControlAction]:
-        """Get recent control actions for efficiency analysis."""
+        Tables with no rows inside their windows are skipped entirely. With
+        a ``sessionmaker`` the remaining queries run concurrently, each on
+        its own connection.
+        """
 
-        cutoff_time = datetime.utcnow() - timedelta(days=days)
-        result = await self.session.execute(
-            select(ControlAction)
-            .where(ControlAction.executed_at >= cutoff_time)
-            .order_by(ControlAction.executed_at.desc())
-            .limit(200)
-        )
-        return result.scalars().all()
+        now = self._now()
+        activity = await self._check_recent_activity(now)
 
-    async def _get_recent_user_interactions(self, days: int = 14) -> List[Event]:
-        """Get recent user interaction events."""
+        reads = {}
+        if activity["experiences"]:
+            reads["positive_experiences"] = (
+                _POSITIVE_EXPERIENCES_STMT,
+                {
+                    "cutoff": now - timedelta(days=7),
+                    "min_bucket_size": self.min_experiences_for_learning,
+                },
+            )
+            reads["outcome_stats"] = (
+                _OUTCOME_STATS_STMT,
+                {"cutoff": now - timedelta(days=3)},
+            )
+        if activity["events"]:
+            reads["events"] = (
+                _LEARNING_EVENTS_STMT,
+                {
+                    "interaction_cutoff": now - timedelta(days=14),
+                    "error_cutoff": now - timedelta(days=7),
+                },
+            )
+        if activity["control_actions"]:
+            reads["control_actions"] = (
+                _CONTROL_ACTIONS_STMT,
+                {"cutoff": now - timedelta(days=7)},
+            )
 
-        cutoff_time = datetime.utcnow() - timedelta(days=days)
-        result = await self.session.execute(
-            select(Event)
-            .where(
-                and_(Event.event_type == "user_query", Event.created_at >= cutoff_time)
+        if self.sessionmaker is not None:
+            results = await asyncio.gather(
+                *(self._execute_read(*read) for read in reads.values())
             )
-            .order_by(Event.created_at.desc())
-            .limit(100)
-        )
-        return result.scalars().all()
+        else:
+            # A single AsyncSession cannot run statements concurrently
+            results = [await self.session.execute(*read) for read in reads.values()]
+        results = dict(zip(reads, results))
+
+        corpus = {
+            "positive_experiences": ExperienceBatch.from_experiences(
+                results["positive_experiences"].all()
+                if "positive_experiences" in results
+                else []
+            ),
+            "outcome_stats": (
+                results["outcome_stats"].all() if "outcome_stats" in results else []
+            ),
+            "user_interactions": [],
+            "error_events": [],
+            "control_actions": (
+                results["control_actions"].all() if "control_actions" in results else []
+            ),
+        }
+        if "events" in results:
+            for event, tag in results["events"].all():
+                corpus[tag].append(event)
 
-    async def _get_recent_error_events(self, days: int = 7) -> List[Event]:
-        """Get recent error events for learning."""
+        return corpus
 
-        cutoff_time = datetime.utcnow() - timedelta(days=days)
-        result = await self.session.execute(
-            select(Event)
-            .where(
-                and_(
-                    Event.severity.in_(["high", "critical"]),
-                    Event.created_at >= cutoff_time,
-                )
-            )
-            .order_by(Event.created_at.desc())
-            .limit(50)
-        )
-        return result.scalars().all()
+    async def _execute_read(
+        self, statement: Any, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """Run a read-only query in its own short-lived session.
 
-    def _group_experiences_by_pattern(
-        self, experiences: List[Experience]
-    ) -> Dict[str, List[Experience]]:
-        """Group experiences by potential patterns."""
+        Async session results are fully buffered, so rows remain usable
+        after the session closes; nothing is flushed or committed. Without
+        a ``sessionmaker`` the query runs on the shared session.
+        """
 
-        groups = {}
+        if self.sessionmaker is None:
+            return await self.session.execute(statement, params)
 
-        for experience in experiences:
-            # Group by experience type and context
-            pattern_key = f"{experience.experience_type}_{experience.outcome}"
-
-            # Add context from experience context
-            if experience.context:
-                if "device_type" in experience.context:
-                    pattern_key += f"_{experience.context['device_type']}"
-                if "time_of_day" in experience.context:
-                    hour = experience.created_at.hour
-                    time_period = (
-                        "morning"
-                        if 6 <= hour < 12
-                        else "afternoon"
-                        if 12 <= hour < 18
-                        else "evening"
-                        if 18 <= hour < 22
-                        else "night"
-                    )
-                    pattern_key += f"_{time_period}"
+        async with self.sessionmaker() as session:
+            return await session.execute(statement, params)
+
+    async def _check_recent_activity(self, now: datetime) -> Dict[str, bool]:
+        """Report which learning tables have rows inside their windows.
+
+        Uses a single EXISTS round-trip, reused for ``activity_check_ttl``
+        seconds so rapid successive cycles skip the probe.
+        """
 
-            if pattern_key not in groups:
-                groups[pattern_key] = []
-            groups[pattern_key].append(experience)
+        checked_at = time.monotonic()
+        if (
+            self._activity_cache
+            and checked_at - self._activity_cache[0] < self.activity_check_ttl
+        ):
+            return self._activity_cache[1]
+
+        result = await self.session.execute(
+            _RECENT_ACTIVITY_STMT,
+            {
+                "experience_cutoff": now - timedelta(days=7),
+                "event_cutoff": now - timedelta(days=14),
+                "action_cutoff": now - timedelta(days=7),
+            },
+        )
+        activity = {key: bool(value) for key, value in result.one()._mapping.items()}
+
+        self._activity_cache = (checked_at, activity)
+        return activity
+
+    def _group_experiences_by_pattern(
+        self, experiences: ExperienceBatch
+    ) -> Dict[str, List[int]]:
+        """Group experience row indices by potential patterns."""
+
+        groups = defaultdict(list)
+        key_formats = self._PATTERN_KEY_FORMATS
+
+        for i, context in enumerate(experiences.contexts):
+            # Group by experience type and outcome, plus the device type and
+            # time period when the experience context records them
+            key_format = key_formats["device_type" in context, "time_of_day" in context]
+            pattern_key = key_format(
+                experiences.types[i],
+                experiences.outcomes[i],
+                context.get("device_type"),
+                self._HOUR_BUCKETS[experiences.hours[i]],
+            )
+            groups[pattern_key].append(i)
 
         return groups
 
-    async def _analyze_experience_pattern(
-        self, experiences: List[Experience]
+    def _analyze_experience_pattern(
+        self, experiences: ExperienceBatch
     ) -> Dict[str, Any]:
         """Analyze a group of experiences to discover patterns."""
 
+        n = len(experiences)
+
         pattern = {
-            "type": experiences[0].experience_type,
-            "sample_size": len(experiences),
-            "success_rate": sum(1 for e in experiences if e.outcome == "positive")
-            / len(experiences),
-            "average_impact": np.mean([e.impact_score for e in experiences]),
+            "type": experiences.types[0],
+            "sample_size": n,
+            "success_rate": experiences.positive.mean(),
+            "average_impact": experiences.impacts.mean(),
             "common_contexts": {},
             "temporal_patterns": {},
             "confidence": 0.0,
         }
 
-        # Analyze common contexts
-        all_contexts = [e.context for e in experiences if e.context]
-        if all_contexts:
-            context_keys = set()
-            for context in all_contexts:
-                context_keys.update(context.keys())
-
-            for key in context_keys:
-                values = [
-                    context.get(key) for context in all_contexts if context.get(key)
-                ]
-                if values:
-                    most_common = max(set(values), key=values.count)
-                    frequency = values.count(most_common) / len(values)
-                    if frequency > 0.6:  # Strong pattern
-                        pattern["common_contexts"][key] = {
-                            "value": most_common,
-                            "frequency": frequency,
-                        }
+        # Analyze common contexts: one pass tallies every key's values
+        context_counts = defaultdict(Counter)
+        for context in experiences.contexts:
+            for key, value in context.items():
+                if value:
+                    context_counts[key][value] += 1
+
+        for key, counts in context_counts.items():
+            most_common, count = counts.most_common(1)[0]
+            frequency = count / counts.total()
+            if frequency > 0.6:  # Strong pattern
+                pattern["common_contexts"][key] = {
+                    "value": most_common,
+                    "frequency": frequency,
+                }
 
         # Analyze temporal patterns
-        hours = [e.created_at.hour for e in experiences]
-        hour_counts = {}
-        for hour in hours:
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
-
-        if hour_counts:
-            peak_hour = max(hour_counts, key=hour_counts.get)
-            peak_frequency = hour_counts[peak_hour] / len(hours)
-            if peak_frequency > 0.3:
-                pattern["temporal_patterns"]["peak_hour"] = {
-                    "hour": peak_hour,
-                    "frequency": peak_frequency,
-                }
+        hour_counts = np.bincount(experiences.hours, minlength=24)
+        peak_hour = int(hour_counts.argmax())
+        peak_frequency = hour_counts[peak_hour] / n
+        if peak_frequency > 0.3:
+            pattern["temporal_patterns"]["peak_hour"] = {
+                "hour": peak_hour,
+                "frequency": peak_frequency,
+            }
 
         # Calculate confidence
         confidence_factors = [
@@ -543,46 +1014,29 @@ async def _analyze_experience_pattern(
 
         return pattern
 
-    async def _analyze_outcome_patterns(
-        self, experiences: List[Experience]
+    def _analyze_outcome_patterns(
+        self, outcome_stats: List[Any]
     ) -> Dict[str, Dict[str, Any]]:
-        """Analyze patterns in experience outcomes."""
+        """Analyze patterns in experience outcomes from aggregated rows."""
 
         outcome_analysis = {}
 
-        # Group by behavior context
-        behavior_contexts = {}
-        for experience in experiences:
-            context_key = experience.experience_type
-            if experience.context and "behavior_context" in experience.context:
-                context_key = experience.context["behavior_context"]
-
-            if context_key not in behavior_contexts:
-                behavior_contexts[context_key] = []
-            behavior_contexts[context_key].append(experience)
-
-        # Analyze each context
-        for context, context_experiences in behavior_contexts.items():
-            if len(context_experiences) >= 2:
-                positive_outcomes = sum(
-                    1 for e in context_experiences if e.outcome == "positive"
-                )
-                total_outcomes = len(context_experiences)
-
-                outcome_analysis[context] = {
-                    "total_outcomes": total_outcomes,
-                    "positive_outcomes": positive_outcomes,
-                    "negative_outcomes": total_outcomes - positive_outcomes,
-                    "success_rate": positive_outcomes / total_outcomes,
-                    "average_impact": np.mean(
-                        [e.impact_score for e in context_experiences]
-                    ),
-                    "sample_size": total_outcomes,
-                }
+        for row in outcome_stats:
+            total_outcomes = row.total_outcomes
+            positive_outcomes = row.positive_outcomes
+
+            outcome_analysis[row.behavior_context] = {
+                "total_outcomes": total_outcomes,
+                "positive_outcomes": positive_outcomes,
+                "negative_outcomes": total_outcomes - positive_outcomes,
+                "success_rate": positive_outcomes / total_outcomes,
+                "average_impact": row.average_impact,
+                "sample_size": total_outcomes,
+            }
 
         return outcome_analysis
 
-    async def _generate_behavior_adaptation(
+    def _generate_behavior_adaptation(
         self, behavior_context: str, analysis: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate behavior adaptation based on outcome analysis."""
@@ -625,11 +1079,9 @@ async def _generate_behavior_adaptation(
 
         # Calculate confidence and expected improvement
         if adaptation["recommended_changes"]:
-            adaptation["expected_improvement"] = np.mean(
-                [
-                    change["expected_impact"]
-                    for change in adaptation["recommended_changes"]
-                ]
+            adaptation["expected_improvement"] = fmean(
+                change["expected_impact"]
+                for change in adaptation["recommended_changes"]
             )
             adaptation["confidence"] = min(
                 0.9, (1 - analysis["success_rate"]) * adaptation["expected_improvement"]
@@ -654,29 +1106,39 @@ def _group_control_actions(
 
         return groups
 
-    async def _analyze_action_efficiency(
+    def _analyze_action_efficiency(
         self, actions: List[ControlAction]
     ) -> Dict[str, Any]:
         """Analyze efficiency of control actions."""
 
+        # Single pass: count successes and collect execution times
+        successful_actions = 0
+        execution_times = np.empty(len(actions), dtype=np.float64)
+        timed_actions = 0
+        for status, created_at, executed_at in map(_ACTION_FIELDS, actions):
+            if status == "completed":
+                successful_actions += 1
+            if executed_at and created_at:
+                execution_times[timed_actions] = (
+                    executed_at - created_at
+                ).total_seconds()
+                timed_actions += 1
+        execution_times = execution_times[:timed_actions]
+
         analysis = {
             "total_actions": len(actions),
-            "successful_actions": sum(1 for a in actions if a.status == "completed"),
+            "successful_actions": successful_actions,
             "average_execution_time": 0.0,
             "improvement_potential": 0.0,
             "efficiency_score": 0.0,
         }
 
         # Calculate execution time metrics
-        execution_times = []
-        for action in actions:
-            if action.executed_at and action.created_at:
-                exec_time = (action.executed_at - action.created_at).total_seconds()
-                execution_times.append(exec_time)
-
-        if execution_times:
-            analysis["average_execution_time"] = np.mean(execution_times)
-            analysis["execution_time_variance"] = np.var(execution_times)
+        if timed_actions:
+            (
+                analysis["average_execution_time"],
+                analysis["execution_time_variance"],
+            ) = _mean_var(execution_times)
 
             # High variance suggests optimization opportunity
             if analysis["execution_time_variance"] > analysis["average_execution_time"]:
@@ -699,7 +1161,7 @@ async def _analyze_action_efficiency(
 
         return analysis
 
-    async def _generate_efficiency_optimization(
+    def _generate_efficiency_optimization(
         self, group_key: str, analysis: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate efficiency optimization recommendations."""
@@ -752,7 +1214,7 @@ async def _generate_efficiency_optimization(
 
         return optimization
 
-    async def _analyze_preference_patterns(
+    def _analyze_preference_patterns(
         self, interactions: List[Event]
     ) -> Dict[str, Dict[str, Any]]:
         """Analyze user preference patterns from interactions."""
@@ -760,34 +1222,37 @@ async def _analyze_preference_patterns(
         patterns = {}
 
         # Analyze timing preferences
-        hours = [interaction.created_at.hour for interaction in interactions]
-        hour_counts = {}
-        for hour in hours:
-            hour_counts[hour] = hour_counts.get(hour, 0) + 1
-
-        if hour_counts:
-            peak_hours = sorted(hour_counts.items(), key=lambda x: x[1], reverse=True)[
-                :3
-            ]
-            total_interactions = len(interactions)
+        total_interactions = len(interactions)
+        if total_interactions:
+            hours = np.fromiter(
+                (interaction.created_at.hour for interaction in interactions),
+                dtype=np.int64,
+                count=total_interactions,
+            )
+            hour_counts = np.bincount(hours, minlength=24)
 
-            if peak_hours[0][1] / total_interactions > 0.2:  # Significant preference
+            # Up to three busiest hours, highest count first
+            peak_hours = np.argsort(-hour_counts, kind="stable")[:3]
+            peak_hours = peak_hours[hour_counts[peak_hours] > 0]
+            peak_counts = hour_counts[peak_hours]
+
+            if peak_counts[0] / total_interactions > 0.2:  # Significant preference
                 patterns["timing_preference"] = {
-                    "preferred_hours": [hour for hour, count in peak_hours],
-                    "confidence": peak_hours[0][1] / total_interactions,
-                    "pattern_strength": sum(count for _, count in peak_hours)
-                    / total_interactions,
+                    "preferred_hours": peak_hours.tolist(),
+                    "confidence": peak_counts[0] / total_interactions,
+                    "pattern_strength": peak_counts.sum() / total_interactions,
                 }
 
         # Analyze interaction type preferences
-        interaction_types = {}
-        for interaction in interactions:
-            if interaction.event_data and "query_type" in interaction.event_data:
-                query_type = interaction.event_data["query_type"]
-                interaction_types[query_type] = interaction_types.get(query_type, 0) + 1
+        query_types = [
+            interaction.event_data["query_type"]
+            for interaction in interactions
+            if interaction.event_data and "query_type" in interaction.event_data
+        ]
+        interaction_types = Counter(query_types)
 
         if interaction_types:
-            total_types = sum(interaction_types.values())
+            total_types = len(query_types)
             preferred_types = [
                 (t, c) for t, c in interaction_types.items() if c / total_types > 0.2
             ]
@@ -796,13 +1261,19 @@ async def _analyze_preference_patterns(
                 patterns["interaction_preference"] = {
                     "preferred_types": [t for t, _ in preferred_types],
                     "confidence": max(c for _, c in preferred_types) / total_types,
-                    "type_distribution": interaction_types,
+                    "type_distribution": dict(interaction_types),
                 }
 
         return patterns
 
-    async def _analyze_error_context(self, error_event: Event) -> Dict[str, Any]:
-        """Analyze the context of an error event."""
+    async def _analyze_error_context(
+        self, error_event: Event, include_related: bool = True
+    ) -> Dict[str, Any]:
+        """Analyze the context of an error event.
+
+        With ``include_related`` False the surrounding events are only
+        counted, enough to detect overload, and ``related_events`` is empty.
+        """
 
         analysis = {
             "error_type": error_event.event_type,
@@ -816,42 +1287,42 @@ async def _analyze_error_context(self, error_event: Event) -> Dict[str, Any]:
 
         # Look for related events around the error time
         time_window = timedelta(minutes=30)
-        related_events = await self.session.execute(
-            select(Event)
-            .where(
-                and_(
-                    Event.created_at >= error_event.created_at - time_window,
-                    Event.created_at <= error_event.created_at + time_window,
-                    Event.id != error_event.id,
-                )
-            )
-            .limit(10)
-        )
+        window = {
+            "window_start": error_event.created_at - time_window,
+            "window_end": error_event.created_at + time_window,
+            "error_id": error_event.id,
+        }
 
-        analysis["related_events"] = [
-            {
-                "event_type": event.event_type,
-                "severity": event.severity,
-                "time_offset": (
-                    event.created_at - error_event.created_at
-                ).total_seconds(),
-            }
-            for event in related_events.scalars()
-        ]
+        if include_related:
+            related_events = await self._execute_read(_RELATED_EVENTS_STMT, window)
+
+            error_time = error_event.created_at
+            analysis["related_events"] = [
+                {
+                    "event_type": event_type,
+                    "severity": severity,
+                    "time_offset": (created_at - error_time).total_seconds(),
+                }
+                for event_type, severity, created_at in related_events.all()
+            ]
+            related_count = len(analysis["related_events"])
+        else:
+            related_count = (
+                await self._execute_read(_RELATED_EVENT_COUNT_STMT, window)
+            ).scalar_one()
 
         # Identify potential causes based on context
         if "device_id" in analysis["context"]:
             analysis["potential_causes"].append("device_malfunction")
 
-        if "network" in error_event.event_type.lower():
-            analysis["potential_causes"].append("connectivity_issue")
+        analysis["potential_causes"].extend(_event_type_causes(error_event.event_type))
 
-        if len(analysis["related_events"]) > 3:
+        if related_count > 3:
             analysis["potential_causes"].append("system_overload")
 
         return analysis
 
-    async def _generate_error_prevention(
+    def _generate_error_prevention(
         self, error_analysis: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate error prevention strategies."""
@@ -865,46 +1336,18 @@ async def _generate_error_prevention(
 
         # Generate strategies based on potential causes
         for cause in error_analysis["potential_causes"]:
-            if cause == "device_malfunction":
-                prevention["strategies"].append(
-                    {
-                        "type": "device_monitoring",
-                        "description": "Implement enhanced device health monitoring",
-                        "implementation": "Add device status checks before critical operations",
-                    }
-                )
-
-            elif cause == "connectivity_issue":
-                prevention["strategies"].append(
-                    {
-                        "type": "connectivity_resilience",
-                        "description": "Improve network connectivity resilience",
-                        "implementation": "Add connection retry logic and offline mode fallbacks",
-                    }
-                )
-
-            elif cause == "system_overload":
-                prevention["strategies"].append(
-                    {
-                        "type": "load_management",
-                        "description": "Implement better system load management",
-                        "implementation": "Add request queuing and rate limiting",
-                    }
-                )
+            strategy = _PREVENTION_STRATEGIES.get(cause)
+            if strategy:
+                prevention["strategies"].append(strategy)
 
         # Set priority based on severity
-        if error_analysis["severity"] == "critical":
-            prevention["priority"] = "high"
-            prevention["confidence"] = 0.8
-        elif error_analysis["severity"] == "high":
-            prevention["priority"] = "medium"
-            prevention["confidence"] = 0.7
-        else:
-            prevention["confidence"] = 0.6
+        prevention["priority"], prevention["confidence"] = _SEVERITY_PREVENTION.get(
+            error_analysis["severity"], ("medium", 0.6)
+        )
 
         return prevention
 
-    async def _store_pattern_memory(
+    def _store_pattern_memory(
         self, pattern_type: str, pattern: Dict[str, Any], experiences: List[Experience]
     ):
         """Store discovered pattern as a learning memory."""
@@ -914,11 +1357,11 @@ async def _store_pattern_memory(
             "pattern_type": pattern_type,
             "pattern_data": pattern,
             "source_experiences": [e.id for e in experiences],
-            "discovery_date": datetime.utcnow().isoformat(),
+            "discovery_date": self._now_iso(),
             "learning_type": "pattern_recognition",
         }
 
-        await self.memory_repo.create(
+        self._queue_memory(
             memory_type="procedural",
             category="pattern_learning",
             importance=pattern["confidence"],
@@ -931,7 +1374,7 @@ async def _store_pattern_memory(
             related_entities=[],
         )
 
-    async def _store_adaptation_memory(
+    def _store_adaptation_memory(
         self,
         behavior_context: str,
         adaptation: Dict[str, Any],
@@ -944,11 +1387,11 @@ async def _store_adaptation_memory(
             "behavior_context": behavior_context,
             "adaptation_data": adaptation,
             "analysis": analysis,
-            "adaptation_date": datetime.utcnow().isoformat(),
+            "adaptation_date": self._now_iso(),
             "learning_type": "behavior_adaptation",
         }
 
-        await self.memory_repo.create(
+        self._queue_memory(
             memory_type="procedural",
             category="behavior_learning",
             importance=adaptation["confidence"],
@@ -961,7 +1404,7 @@ async def _store_adaptation_memory(
             related_entities=[behavior_context],
         )
 
-    async def _store_efficiency_memory(
+    def _store_efficiency_memory(
         self, group_key: str, optimization: Dict[str, Any], analysis: Dict[str, Any]
     ):
         """Store efficiency optimization as a learning memory."""
@@ -971,11 +1414,11 @@ async def _store_efficiency_memory(
             "group_key": group_key,
             "optimization_data": optimization,
             "analysis": analysis,
-            "optimization_date": datetime.utcnow().isoformat(),
+            "optimization_date": self._now_iso(),
             "learning_type": "efficiency_optimization",
         }
 
-        await self.memory_repo.create(
+        self._queue_memory(
             memory_type="procedural",
             category="efficiency_learning",
             importance=optimization["confidence"],
@@ -988,20 +1431,18 @@ async def _store_efficiency_memory(
             related_entities=[group_key],
         )
 
-    async def _store_preference_memory(
-        self, preference_type: str, pattern: Dict[str, Any]
-    ):
+    def _store_preference_memory(self, preference_type: str, pattern: Dict[str, Any]):
         """Store learned user preference as memory."""
 
         memory_data = {
             "event_type": "preference_learning",
             "preference_type": preference_type,
             "pattern_data": pattern,
-            "learning_date": datetime.utcnow().isoformat(),
+            "learning_date": self._now_iso(),
             "learning_type": "user_preference_learning",
         }
 
-        await self.memory_repo.create(
+        self._queue_memory(
             memory_type="semantic",
             category="user_preferences",
             importance=pattern["confidence"],
@@ -1014,7 +1455,7 @@ async def _store_preference_memory(
             related_entities=["user_preferences"],
         )
 
-    async def _store_error_learning_memory(
+    def _store_error_learning_memory(
         self, error_event: Event, analysis: Dict[str, Any], prevention: Dict[str, Any]
     ):
         """Store error learning as memory."""
@@ -1027,12 +1468,15 @@ async def _store_error_learning_memory(
                 "severity": error_event.severity,
             },
             "analysis": analysis,
-            "prevention_strategy": prevention,
-            "learning_date": datetime.utcnow().isoformat(),
+            "prevention_strategy": {
+                **prevention,
+                "strategies": [asdict(s) for s in prevention["strategies"]],
+            },
+            "learning_date": self._now_iso(),
             "learning_type": "error_correction",
         }
 
-        await self.memory_repo.create(
+        self._queue_memory(
             memory_type="procedural",
             category="error_learning",
             importance=prevention["confidence"],
@@ -1045,6 +1489,90 @@ async def _store_error_learning_memory(
             related_entities=[error_event.event_type],
         )
 
+    def _queue_memory(self, **fields: Any):
+        """Queue a learning memory for the next batched insert."""
+
+        self._pending_memories.append(Memory(**fields))
+
+    async def _flush_pending_memories(self):
+        """Insert all queued learning memories with a single flush."""
+
+        if not self._pending_memories:
+            return
+
+        memories, self._pending_memories = self._pending_memories, []
+
+        # Hand off to the background writer when one is running
+        if self._memory_queue is not None:
+            for memory in memories:
+                await self._memory_queue.put(memory)
+            return
+
+        self.session.add_all(memories)
+        await self.session.flush()
+
+    async def start_memory_writer(
+        self, sessionmaker: async_sessionmaker, max_queued: int = 1024
+    ):
+        """Write learning memories from a background task on its own sessions.
+
+        Cycles then only enqueue their memories; the writer inserts them in
+        batches of up to ``memory_batch_size``, waiting at most
+        ``memory_flush_interval`` seconds to fill a batch. The bounded queue
+        applies backpressure if the database falls behind.
+        """
+
+        if self._memory_writer_task is not None:
+            return
+
+        self._memory_queue = asyncio.Queue(maxsize=max_queued)
+        self._memory_writer_task = asyncio.create_task(
+            self._memory_writer_loop(self._memory_queue, sessionmaker)
+        )
+
+    async def stop_memory_writer(self):
+        """Write any queued learning memories, then stop the background writer."""
+
+        if self._memory_writer_task is None:
+            return
+
+        queue, self._memory_queue = self._memory_queue, None
+        await queue.join()
+
+        self._memory_writer_task.cancel()
+        try:
+            await self._memory_writer_task
+        except asyncio.CancelledError:
+            pass
+        self._memory_writer_task = None
+
+    async def _memory_writer_loop(
+        self, queue: asyncio.Queue, sessionmaker: async_sessionmaker
+    ):
+        """Insert queued learning memories in batches until cancelled."""
+
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.memory_flush_interval
+            while len(batch) < self.memory_batch_size:
+                try:
+                    batch.append(
+                        await asyncio.wait_for(queue.get(), deadline - loop.time())
+                    )
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                async with sessionmaker() as session:
+                    session.add_all(batch)
+                    await session.commit()
+            except Exception as e:
+                logger.error(f"Failed to write {len(batch)} learning memories: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
     async def _create_learning_memory(
         self,
         experience_data: Dict[str, Any],
@@ -1058,7 +1586,7 @@ async def _create_learning_memory(
             "original_experience": experience_data,
             "outcome": outcome,
             "learning_result": learning_result,
-            "learning_date": datetime.utcnow().isoformat(),
+            "learning_date": self._now_iso(),
         }
 
         # Calculate importance from learning result
@@ -1072,30 +1600,35 @@ async def _create_learning_memory(
 
         importance = min(1.0, importance)
 
-        await self.memory_repo.create(
-            memory_type="procedural",
-            category="learning_experience",
-            importance=importance,
-            title=f"Learning Experience: {experience_data.get('event_type', 'Unknown')}",
-            description=f"Learning from {outcome} outcome with {len(learning_result['insights_gained'])} insights gained",
-            content=memory_data,
-            source="learning_engine",
-            confidence=0.8,
-            tags=["learning", "experience", outcome],
-            related_entities=[],
+        # Persist only this memory; a running cycle's queue is left for
+        # process_learning_updates to commit
+        self.session.add(
+            Memory(
+                memory_type="procedural",
+                category="learning_experience",
+                importance=importance,
+                title=f"Learning Experience: {experience_data.get('event_type', 'Unknown')}",
+                description=f"Learning from {outcome} outcome with {len(learning_result['insights_gained'])} insights gained",
+                content=memory_data,
+                source="learning_engine",
+                confidence=0.8,
+                tags=["learning", "experience", outcome],
+                related_entities=[],
+            )
         )
+        await self.session.commit()
 
-    async def _store_learning_insights(self, update_count: int):
+    def _store_learning_insights(self, update_count: int, metrics: Dict[str, int]):
         """Store summary of learning updates as memory."""
 
         insight_data = {
             "event_type": "learning_cycle_summary",
             "updates_processed": update_count,
-            "performance_metrics": self.performance_metrics.copy(),
-            "cycle_date": datetime.utcnow().isoformat(),
+            "performance_metrics": metrics,
+            "cycle_date": self._now_iso(),
         }
 
-        await self.memory_repo.create(
+        self._queue_memory(
             memory_type="semantic",
             category="learning_progress",
             importance=min(1.0, update_count * 0.1),
@@ -1108,37 +1641,30 @@ async def _store_learning_insights(self, update_count: int):
             related_entities=["learning_engine"],
         )
 
-    async def _update_learning_metrics(self):
-        """Update learning performance metrics."""
+    def _queue_metrics_update(self, metrics: Dict[str, int]):
+        """Add a learning metrics event for the cycle's commit."""
 
         # Store metrics in event log
         metrics_event = Event(
             event_type="learning_metrics_update",
             severity="info",
-            event_data=self.performance_metrics.copy(),
+            event_data=metrics,
         )
 
         self.session.add(metrics_event)
-        await self.session.commit()
 
     def _classify_learning_opportunity(
         self, experience_data: Dict[str, Any], outcome: str
     ) -> str:
         """Classify the type of learning opportunity."""
 
-        # Determine learning type based on experience characteristics
-        if "pattern" in experience_data.get("event_type", "").lower():
-            return "pattern_recognition"
-        elif "user" in experience_data.get("source", "").lower():
-            return "user_preference_learning"
-        elif "error" in outcome or "failure" in outcome:
-            return "error_correction"
-        elif "efficiency" in experience_data.get("event_type", ""):
-            return "efficiency_optimization"
-        else:
-            return "behavior_adaptation"
+        return _classify_learning_type(
+            experience_data.get("event_type", ""),
+            experience_data.get("source", ""),
+            outcome,
+        )
 
-    async def _extract_learning_insights(
+    def _extract_learning_insights(
         self,
         experience_data: Dict[str, Any],
         outcome: str,
@@ -1175,7 +1701,7 @@ async def _extract_learning_insights(
 
         return insights
 
-    async def _update_behavior_patterns(
+    def _update_behavior_patterns(
         self, experience_data: Dict[str, Any], outcome: str, insights: List[str]
     ) -> List[str]:
         """Update behavior patterns based on experience."""
@@ -1192,7 +1718,7 @@ async def _update_behavior_patterns(
 
         return updates
 
-    async def _discover_patterns(
+    def _discover_patterns(
         self, experience_data: Dict[str, Any], outcome: str
     ) -> List[str]:
         """Discover new patterns from experience."""
@@ -1200,7 +1726,7 @@ async def _discover_patterns(
         patterns = []
 
         # Time-based patterns
-        current_hour = datetime.utcnow().hour
+        current_hour = self._now().hour
         if "timing_pattern" not in experience_data:
             patterns.append(
                 f"Potential time pattern: {outcome} outcome at hour {current_hour}"
@@ -1216,7 +1742,7 @@ async def _discover_patterns(
 
         return patterns
 
-    async def _update_confidence_levels(
+    def _update_confidence_levels(
         self, experience_data: Dict[str, Any], outcome: str
     ) -> Dict[str, float]:
         """Update confidence levels based on experience outcome."""
@@ -1234,7 +1760,7 @@ async def _update_confidence_levels(
 
         return updates
 
-    async def _generate_learning_recommendations(
+    def _generate_learning_recommendations(
         self, learning_result: Dict[str, Any]
     ) -> List[str]:
         """Generate recommendations based on learning results."""
@@ -1256,9 +1782,7 @@ async def _generate_learning_recommendations(
 
         return recommendations
 
-    async def _analyze_context_for_learning(
-        self, context: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    def _analyze_context_for_learning(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze context for learning opportunities."""
 
         analysis = {
@@ -1269,12 +1793,16 @@ async def _analyze_context_for_learning(
         }
 
         # Assess novelty
-        context_keys = set(context.keys())
-        if len(context_keys) > 3:
+        if len(context) > 3:
             analysis["novelty_score"] = 0.7
 
-        # Assess complexity
-        nested_values = sum(1 for v in context.values() if isinstance(v, (dict, list)))
+        # Assess complexity; the score saturates after four nested values
+        nested_values = 0
+        for value in context.values():
+            if isinstance(value, (dict, list)):
+                nested_values += 1
+                if nested_values == 4:
+                    break
         analysis["complexity_score"] = min(1.0, nested_values * 0.3)
 
         # Assess uncertainty
@@ -1283,33 +1811,40 @@ async def _analyze_context_for_learning(
 
         # Assess potential impact
         if "priority" in context:
-            priority_map = {"high": 0.9, "medium": 0.6, "low": 0.3}
-            analysis["potential_impact"] = priority_map.get(context["priority"], 0.5)
+            analysis["potential_impact"] = _PRIORITY_IMPACT.get(
+                context["priority"], 0.5
+            )
 
         return analysis
 
-    async def _calculate_learning_opportunity_score(
+    def _calculate_learning_opportunity_score(
         self, context_analysis: Dict[str, Any]
     ) -> float:
         """Calculate overall learning opportunity score."""
 
-        weights = {
-            "novelty_score": 0.3,
-            "complexity_score": 0.2,
-            "uncertainty_score": 0.3,
-            "potential_impact": 0.2,
-        }
-
+        weights = _OPPORTUNITY_WEIGHTS
         total_score = 0.0
         for factor, score in context_analysis.items():
-            weight = weights.get(factor, 0.0)
-            total_score += score * weight
+            total_score += score * weights.get(factor, 0.0)
 
         return min(1.0, total_score)
 
-    async def _identify_primary_learning_type(
-        self, context_analysis: Dict[str, Any]
-    ) -> str:
+    def _score_opportunities_batch(
+        self, context_analyses: List[Dict[str, Any]]
+    ) -> np.ndarray:
+        """Score many context analyses with one matrix-vector product."""
+
+        factors = np.array(
+            [
+                [analysis[factor] for factor in _OPPORTUNITY_WEIGHTS]
+                for analysis in context_analyses
+            ],
+            dtype=np.float64,
+        ).reshape(len(context_analyses), len(_OPPORTUNITY_WEIGHTS))
+
+        return np.minimum(1.0, factors @ _OPPORTUNITY_WEIGHT_VECTOR)
+
+    def _identify_primary_learning_type(self, context_analysis: Dict[str, Any]) -> str:
         """Identify the primary learning type for the opportunity."""
 
         if context_analysis["novelty_score"] > 0.7:
@@ -1321,7 +1856,7 @@ async def _identify_primary_learning_type(
         else:
             return "user_preference_learning"
 
-    async def _predict_potential_insights(
+    def _predict_potential_insights(
         self, context_analysis: Dict[str, Any], learning_type: str
     ) -> List[str]:
         """Predict potential insights from learning opportunity."""
@@ -1342,7 +1877,7 @@ async def _predict_potential_insights(
 
         return insights
 
-    async def _recommend_learning_actions(
+    def _recommend_learning_actions(
         self, context_analysis: Dict[str, Any], learning_type: str
     ) -> List[str]:
         """Recommend actions to maximize learning from opportunity."""
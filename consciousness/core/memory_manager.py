@@ -1,9 +1,25 @@
 import asyncio
+import json
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import numpy as np
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import (
+    ColumnElement,
+    Text,
+    and_,
+    case,
+    cast,
+    extract,
+    func,
+    literal,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.consciousness import EmotionalState, Experience, Memory
@@ -12,6 +28,178 @@
 from ..repositories.consciousness import EmotionalStateRepository, MemoryRepository
 
 
+@dataclass(frozen=True, slots=True)
+class RetrievedMemory:
+    """A memory returned by retrieval with its relevance and access tracking."""
+
+    memory: Memory
+    relevance_score: float
+    access_count: int
+    last_accessed: datetime
+
+
+@dataclass(slots=True)
+class _GroupSummary:
+    """Aggregates of a memory group, gathered in a single pass."""
+
+    earliest: datetime
+    latest: datetime
+    min_importance: float
+    max_importance: float
+    categories: Set[str]
+    tags: Set[str]
+    entities: Set[str]
+
+    @classmethod
+    def of(cls, memory_group: List[Memory]) -> "_GroupSummary":
+        """Summarize a non-empty memory group."""
+        first = memory_group[0]
+        summary = cls(
+            earliest=first.created_at,
+            latest=first.created_at,
+            min_importance=first.importance,
+            max_importance=first.importance,
+            categories=set(),
+            tags=set(),
+            entities=set(),
+        )
+
+        for memory in memory_group:
+            if memory.created_at < summary.earliest:
+                summary.earliest = memory.created_at
+            elif memory.created_at > summary.latest:
+                summary.latest = memory.created_at
+            if memory.importance < summary.min_importance:
+                summary.min_importance = memory.importance
+            elif memory.importance > summary.max_importance:
+                summary.max_importance = memory.importance
+            summary.categories.add(memory.category)
+            summary.tags.update(memory.tags)
+            summary.entities.update(memory.related_entities)
+
+        return summary
+
+
+# Lowercase names for time-based tags, indexed by weekday() and month - 1
+_WEEKDAYS = (
+    "monday",
+    "tuesday",
+    "wednesday",
+    "thursday",
+    "friday",
+    "saturday",
+    "sunday",
+)
+_MONTHS = (
+    "january",
+    "february",
+    "march",
+    "april",
+    "may",
+    "june",
+    "july",
+    "august",
+    "september",
+    "october",
+    "november",
+    "december",
+)
+
+
+@lru_cache(maxsize=1024)
+def _memory_type_for(source: str, experience_type: str, event_type: str) -> str:
+    """Classify a memory type from an experience's source, type and event type."""
+
+    # Check for specific event types
+    if "user_interaction" in source:
+        return "episodic"
+
+    if "learning" in experience_type:
+        return "procedural"
+
+    if "fact" in experience_type or "knowledge" in experience_type:
+        return "semantic"
+
+    # Default classification based on content
+    content_type = event_type.lower()
+
+    if content_type in ["user_query", "conversation", "interaction"]:
+        return "episodic"
+    elif content_type in [
+        "learning_update",
+        "behavior_change",
+        "skill_acquisition",
+    ]:
+        return "procedural"
+    else:
+        return "semantic"
+
+
+@lru_cache(maxsize=1024)
+def _category_for_event_type(event_type: str) -> str:
+    """Infer a memory category from an event type."""
+    event_type = event_type.lower()
+
+    if "user" in event_type:
+        return "user_interaction"
+    elif "device" in event_type:
+        return "device_management"
+    elif "sensor" in event_type:
+        return "environmental_monitoring"
+    elif "system" in event_type:
+        return "system_operation"
+    elif "learning" in event_type:
+        return "learning_experience"
+    else:
+        return "general"
+
+
+def _json_array_matches(column, items) -> ColumnElement[int]:
+    """Count how many of the given items appear in a JSON array column."""
+    serialized = cast(column, Text)
+    matches = []
+    for item in items:
+        # Serializers differ on escaping non-ASCII, so accept either form
+        forms = {json.dumps(item), json.dumps(item, ensure_ascii=False)}
+        found = or_(*(serialized.contains(form, autoescape=True) for form in forms))
+        matches.append(case((found, 1), else_=0))
+    return sum(matches[1:], matches[0])
+
+
+def _component_labels(adjacency: np.ndarray) -> np.ndarray:
+    """Label each node of an undirected graph with its component's lowest index."""
+    size = len(adjacency)
+    labels = np.arange(size)
+    while True:
+        # Pull the smallest label across every edge until nothing changes
+        neighbour_labels = np.where(adjacency, labels, size).min(axis=1, initial=size)
+        updated = np.minimum(labels, neighbour_labels)
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _jaccard_matrix(item_lists: List[List[str]]) -> np.ndarray:
+    """Pairwise Jaccard overlap of item lists, zero where either side is empty."""
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    columns: List[int] = []
+    for row, items in enumerate(item_lists):
+        for item in set(items):
+            rows.append(row)
+            columns.append(vocabulary.setdefault(item, len(vocabulary)))
+
+    incidence = np.zeros((len(item_lists), len(vocabulary)))
+    incidence[rows, columns] = 1.0
+
+    intersection = incidence @ incidence.T
+    sizes = incidence.sum(axis=1)
+    union = sizes[:, None] + sizes - intersection
+    return np.divide(
+        intersection, union, out=np.zeros_like(intersection), where=union > 0
+    )
+
+
 class MemoryManager:
     """Manages memory formation, consolidation, retrieval, and learning."""
 
@@ -52,6 +240,14 @@ def __init__(self, session: AsyncSession):
         self.consolidation_interval = timedelta(hours=6)
         self.max_memories_per_consolidation = 50
         self.similarity_threshold = 0.75
+        self.decay_batch_size = 500
+
+        # Recent retrieval rankings, least recently used first
+        self.retrieval_cache_size = 128
+        self.retrieval_cache_ttl = 60.0  # seconds
+        self._retrieval_cache: Dict[
+            Tuple, Tuple[List[Tuple[Memory, float]], float]
+        ] = {}
 
     async def consolidate_recent_memories(self) -> int:
         """Consolidate recent memories into more stable long-term memories."""
@@ -65,8 +261,9 @@ async def consolidate_recent_memories(self) -> int:
         consolidation_count = 0
 
         # Group related memories for consolidation
-        memory_groups = await self._group_related_memories(recent_memories)
+        memory_groups = self._group_related_memories(recent_memories)
 
+        single_memories = []
         for group in memory_groups:
             if len(group) > 1:
                 # Consolidate group into a single memory
@@ -74,12 +271,17 @@ async def consolidate_recent_memories(self) -> int:
                 if consolidated_memory:
                     consolidation_count += 1
             else:
-                # Single memory - update importance and make permanent
-                await self._stabilize_single_memory(group[0])
+                single_memories.append(group[0])
+
+        # Single memories - update importance and make permanent
+        await self._stabilize_memories(single_memories)
 
         # Perform memory decay for old memories
         await self._apply_memory_decay()
 
+        # Importances changed, so cached rankings are stale
+        self._retrieval_cache.clear()
+
         return consolidation_count
 
     async def form_memory_from_experience(
@@ -88,24 +290,63 @@ async def form_memory_from_experience(
         emotional_state: Optional[EmotionalState] = None,
     ) -> Memory:
         """Form a new memory from an experience."""
+        memories = await self.form_memories_from_experiences(
+            [experience_data], emotional_state
+        )
+        return memories[0]
+
+    async def form_memories_from_experiences(
+        self,
+        experiences: List[Dict[str, Any]],
+        emotional_state: Optional[EmotionalState] = None,
+    ) -> List[Memory]:
+        """Form memories from a batch of experiences, committing once."""
+        memories = []
+        for experience_data in experiences:
+            # Flushed so later importance counts see it and records can link to it
+            memory = await self._build_memory(experience_data, emotional_state)
+            self.session.add(memory)
+            await self.session.flush()
+
+            # Create experience record if emotional state is provided
+            if emotional_state:
+                self._create_experience_record(memory, emotional_state, experience_data)
+
+            memories.append(memory)
+
+        await self.session.commit()
+        self._retrieval_cache.clear()
+        for memory in memories:
+            await self.session.refresh(memory)
+
+        return memories
+
+    async def _build_memory(
+        self,
+        experience_data: Dict[str, Any],
+        emotional_state: Optional[EmotionalState],
+    ) -> Memory:
+        """Build an unsaved memory from an experience."""
 
-        # Classify the memory type
+        # Classify the memory type and category
         memory_type = self._classify_memory_type(experience_data)
+        category = self._determine_memory_category(experience_data)
 
         # Calculate importance score
-        importance = await self._calculate_importance(experience_data, emotional_state)
+        importance = await self._calculate_importance(
+            experience_data, emotional_state, category
+        )
 
         # Extract key information
-        title = self._generate_memory_title(experience_data)
+        now = datetime.utcnow()
+        title = self._generate_memory_title(experience_data, now)
         description = self._generate_memory_description(experience_data)
-        category = self._determine_memory_category(experience_data)
 
         # Create tags and related entities
-        tags = self._extract_tags(experience_data)
+        tags = self._extract_tags(experience_data, category, now)
         related_entities = self._extract_related_entities(experience_data)
 
-        # Create the memory
-        memory = await self.memory_repo.create(
+        return Memory(
             memory_type=memory_type,
             category=category,
             importance=importance,
@@ -118,56 +359,75 @@ async def form_memory_from_experience(
             related_entities=related_entities,
         )
 
-        # Create experience record if emotional state is provided
-        if emotional_state:
-            await self._create_experience_record(
-                memory, emotional_state, experience_data
-            )
-
-        return memory
-
     async def retrieve_memories(
         self,
         query: str,
         context: Dict[str, Any] = None,
         memory_type: Optional[str] = None,
         limit: int = 10,
-    ) -> List[Dict[str, Any]]:
+    ) -> List[RetrievedMemory]:
         """Retrieve relevant memories based on query and context."""
 
-        # Search memories using repository
-        memories = await self.memory_repo.search_memories(
-            query=query, memory_type=memory_type, limit=limit
-        )
+        context = context or {}
+        cache_key = self._retrieval_cache_key(query, context, memory_type, limit)
+        ranked = self._cached_ranking(cache_key)
+
+        if ranked is None:
+            # Search and rank memories by context relevance in the database
+            ranked = await self.memory_repo.search_memories_ranked(
+                query=query,
+                relevance=self._context_relevance_expression(context),
+                memory_type=memory_type,
+                limit=limit,
+            )
+            self._cache_ranking(cache_key, ranked)
+
+        # Update access tracking for the whole result set at once
+        await self.memory_repo.update_access_many([memory.id for memory, _ in ranked])
+
+        accessed_at = datetime.utcnow()
+        return [
+            RetrievedMemory(
+                memory=memory,
+                relevance_score=relevance_score,
+                access_count=memory.access_count + 1,
+                last_accessed=accessed_at,
+            )
+            for memory, relevance_score in ranked
+        ]
 
-        # Enhance with context relevance scoring
-        enhanced_memories = []
-        for memory in memories:
-            # Update access tracking
-            await self.memory_repo.update_access(memory.id)
+    def _retrieval_cache_key(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        memory_type: Optional[str],
+        limit: int,
+    ) -> Tuple:
+        """Key a retrieval on the inputs its ranking depends on."""
+        # Relevance only reads the context keys and its entities
+        entities = frozenset(context["entities"]) if "entities" in context else None
+        return (query, memory_type, limit, frozenset(context), entities)
+
+    def _cached_ranking(self, cache_key: Tuple) -> Optional[List[Tuple[Memory, float]]]:
+        """Get a cached ranking if it is still fresh."""
+        cached = self._retrieval_cache.pop(cache_key, None)
+        if cached is None:
+            return None
 
-            # Calculate context relevance
-            relevance_score = await self._calculate_context_relevance(
-                memory, context or {}
-            )
+        ranked, cached_at = cached
+        if time.monotonic() - cached_at >= self.retrieval_cache_ttl:
+            return None
 
-            enhanced_memories.append(
-                {
-                    "memory": memory,
-                    "relevance_score": relevance_score,
-                    "access_info": {
-                        "access_count": memory.access_count + 1,
-                        "last_accessed": datetime.utcnow(),
-                    },
-                }
-            )
+        # Reinsert to mark as most recently used
+        self._retrieval_cache[cache_key] = cached
+        return ranked
 
-        # Sort by relevance and importance
-        enhanced_memories.sort(
-            key=lambda x: (x["relevance_score"] * x["memory"].importance), reverse=True
-        )
+    def _cache_ranking(self, cache_key: Tuple, ranked: List[Tuple[Memory, float]]):
+        """Cache a ranking, evicting the least recently used one when full."""
+        if len(self._retrieval_cache) >= self.retrieval_cache_size:
+            del self._retrieval_cache[next(iter(self._retrieval_cache))]
 
-        return enhanced_memories[:limit]
+        self._retrieval_cache[cache_key] = (ranked, time.monotonic())
 
     async def get_related_memories(self, entity: str, limit: int = 5) -> List[Memory]:
         """Get memories related to a specific entity."""
@@ -176,6 +436,7 @@ async def get_related_memories(self, entity: str, limit: int = 5) -> List[Memory
     async def update_memory_importance(self, memory_id: int, new_importance: float):
         """Update the importance of a memory."""
         await self.memory_repo.update(memory_id, importance=new_importance)
+        self._retrieval_cache.clear()
 
     async def _get_unconsolidated_memories(self) -> List[Memory]:
         """Get recent memories that haven't been consolidated."""
@@ -197,39 +458,38 @@ async def _get_unconsolidated_memories(self) -> List[Memory]:
 
         return result.scalars().all()
 
-    async def _group_related_memories(
-        self, memories: List[Memory]
-    ) -> List[List[Memory]]:
-        """Group related memories for potential consolidation."""
-        groups = []
-        processed = set()
-
-        for memory in memories:
-            if memory.id in processed:
-                continue
-
-            # Find similar memories
-            similar_memories = [memory]
-            processed.add(memory.id)
-
-            for other_memory in memories:
-                if other_memory.id in processed:
-                    continue
-
-                similarity = await self._calculate_memory_similarity(
-                    memory, other_memory
-                )
-                if similarity >= self.similarity_threshold:
-                    similar_memories.append(other_memory)
-                    processed.add(other_memory.id)
-
-            groups.append(similar_memories)
+    def _group_related_memories(self, memories: List[Memory]) -> List[List[Memory]]:
+        """Group related memories for potential consolidation.
+
+        Groups are the connected components of the graph linking every pair at
+        or above the similarity threshold, so similarity carries transitively.
+        """
+        similar = self._similarity_matrix(memories) >= self.similarity_threshold
+        labels = _component_labels(similar)
+
+        groups: Dict[int, List[Memory]] = {}
+        for memory, label in zip(memories, labels.tolist()):
+            groups.setdefault(label, []).append(memory)
+
+        return list(groups.values())
+
+    def _similarity_matrix(self, memories: List[Memory]) -> np.ndarray:
+        """Calculate pairwise similarity for a batch of memories at once."""
+        categories = np.array([m.category for m in memories], dtype=object)
+        memory_types = np.array([m.memory_type for m in memories], dtype=object)
+
+        # Same weights and summation order as _calculate_memory_similarity
+        similarity = np.where(categories[:, None] == categories, 0.3, 0.0)
+        similarity += np.where(memory_types[:, None] == memory_types, 0.2, 0.0)
+        similarity += _jaccard_matrix([m.tags for m in memories]) * 0.2
+        similarity += _jaccard_matrix([m.related_entities for m in memories]) * 0.2
+        similarity += (
+            _jaccard_matrix([m.description.lower().split() for m in memories]) * 0.1
+        )
 
-        return groups
+        return np.minimum(1.0, similarity)
 
-    async def _calculate_memory_similarity(
-        self, memory1: Memory, memory2: Memory
-    ) -> float:
+    def _calculate_memory_similarity(self, memory1: Memory, memory2: Memory) -> float:
         """Calculate similarity between two memories."""
         similarity_score = 0.0
 
@@ -285,45 +545,43 @@ async def _consolidate_memory_group(
         if len(memory_group) < 2:
             return None
 
-        # Calculate consolidated importance (max of group)
-        consolidated_importance = max(m.importance for m in memory_group)
+        summary = _GroupSummary.of(memory_group)
 
         # Merge content
-        merged_content = await self._merge_memory_contents(memory_group)
+        merged_content = self._merge_memory_contents(memory_group, summary)
 
         # Create consolidated title and description
         consolidated_title = f"Consolidated: {memory_group[0].category}"
-        consolidated_description = self._create_consolidated_description(memory_group)
-
-        # Merge tags and entities
-        all_tags = set()
-        all_entities = set()
-        for memory in memory_group:
-            all_tags.update(memory.tags)
-            all_entities.update(memory.related_entities)
+        consolidated_description = self._create_consolidated_description(
+            memory_group, summary
+        )
 
         # Create new consolidated memory
         consolidated_memory = await self.memory_repo.create(
             memory_type=memory_group[0].memory_type,
             category=memory_group[0].category,
-            importance=consolidated_importance,
+            importance=summary.max_importance,  # Max of group
             title=consolidated_title,
             description=consolidated_description,
             content=merged_content,
             source="consolidation",
             confidence=0.9,
-            tags=list(all_tags),
-            related_entities=list(all_entities),
+            tags=list(summary.tags),
+            related_entities=list(summary.entities),
         )
 
         # Mark original memories as consolidated (update their importance to low)
-        for memory in memory_group:
-            await self.memory_repo.update(memory.id, importance=0.1)
+        await self.session.execute(
+            update(Memory)
+            .where(Memory.id.in_([memory.id for memory in memory_group]))
+            .values(importance=0.1)
+        )
+        await self.session.commit()
 
         return consolidated_memory
 
-    async def _merge_memory_contents(
-        self, memory_group: List[Memory]
+    def _merge_memory_contents(
+        self, memory_group: List[Memory], summary: _GroupSummary
     ) -> Dict[str, Any]:
         """Merge the contents of multiple memories."""
         merged_content = {
@@ -348,148 +606,208 @@ async def _merge_memory_contents(
         merged_content["summary"] = {
             "total_memories": len(memory_group),
             "time_span": {
-                "earliest": min(m.created_at for m in memory_group).isoformat(),
-                "latest": max(m.created_at for m in memory_group).isoformat(),
+                "earliest": summary.earliest.isoformat(),
+                "latest": summary.latest.isoformat(),
             },
-            "categories": list(set(m.category for m in memory_group)),
+            "categories": list(summary.categories),
             "importance_range": {
-                "min": min(m.importance for m in memory_group),
-                "max": max(m.importance for m in memory_group),
+                "min": summary.min_importance,
+                "max": summary.max_importance,
             },
         }
 
         return merged_content
 
-    def _create_consolidated_description(self, memory_group: List[Memory]) -> str:
+    def _create_consolidated_description(
+        self, memory_group: List[Memory], summary: _GroupSummary
+    ) -> str:
         """Create a description for consolidated memory."""
-        categories = set(m.category for m in memory_group)
-        time_span = max(m.created_at for m in memory_group) - min(
-            m.created_at for m in memory_group
-        )
+        time_span = summary.latest - summary.earliest
 
         description = f"Consolidated memory of {len(memory_group)} related experiences "
-        description += f"in {', '.join(categories)} over {time_span.days} days. "
-        description += f"Key themes: {', '.join(list(set(tag for m in memory_group for tag in m.tags))[:5])}."
+        description += (
+            f"in {', '.join(summary.categories)} over {time_span.days} days. "
+        )
+        description += f"Key themes: {', '.join(list(summary.tags)[:5])}."
 
         return description
 
-    async def _stabilize_single_memory(self, memory: Memory):
-        """Stabilize a single memory by updating its importance."""
+    async def _stabilize_memories(self, memories: List[Memory]):
+        """Stabilize ungrouped memories by updating their importance."""
+        if not memories:
+            return
+
         # Increase importance slightly for memories that survive consolidation
-        new_importance = min(1.0, memory.importance + 0.1)
-        await self.memory_repo.update(memory.id, importance=new_importance)
+        new_importance = Memory.importance + 0.1
+        await self.session.execute(
+            update(Memory)
+            .where(Memory.id.in_([memory.id for memory in memories]))
+            .values(importance=case((new_importance > 1.0, 1.0), else_=new_importance))
+        )
+        await self.session.commit()
 
     async def _apply_memory_decay(self):
         """Apply decay to old memories based on their type and usage."""
         # Get memories older than 7 days
         cutoff_time = datetime.utcnow() - timedelta(days=7)
 
-        old_memories = await self.session.execute(
-            select(Memory).where(
+        now = np.datetime64(datetime.utcnow(), "us")
+
+        # Stream old memories so only one batch of rows is held at a time
+        old_memories = await self.session.stream(
+            select(
+                Memory.id,
+                Memory.memory_type,
+                Memory.importance,
+                func.coalesce(Memory.last_accessed, Memory.created_at),
+            )
+            .where(
                 and_(
                     Memory.created_at < cutoff_time,
                     Memory.importance
                     > 0.1,  # Don't decay already low-importance memories
                 )
             )
+            .execution_options(yield_per=self.decay_batch_size)
         )
 
-        for memory in old_memories.scalars():
-            memory_type_config = self.memory_types.get(memory.memory_type, {})
-            decay_rate = memory_type_config.get("decay_rate", 0.01)
+        decayed = []
+        async for rows in old_memories.partitions():
+            decayed.extend(self._decay_importances(rows, now))
+
+        if not decayed:
+            return
+
+        # One executemany UPDATE keyed on primary key, committed once
+        await self.session.execute(update(Memory), decayed)
+        await self.session.commit()
+
+    def _decay_importances(
+        self, rows: List[Tuple[int, str, float, datetime]], now: np.datetime64
+    ) -> List[Dict[str, Any]]:
+        """Calculate decayed importances for a batch of old memory rows."""
+        ids, memory_types, importances, last_accesses = zip(*rows)
+
+        decay_rates = np.fromiter(
+            (
+                self.memory_types.get(memory_type, {}).get("decay_rate", 0.01)
+                for memory_type in memory_types
+            ),
+            dtype=np.float64,
+            count=len(rows),
+        )
 
-            # Factor in access patterns
-            days_since_access = (
-                datetime.utcnow() - (memory.last_accessed or memory.created_at)
-            ).days
-            access_penalty = min(0.5, days_since_access * 0.01)
+        # Factor in access patterns
+        days_since_access = (
+            now - np.array(last_accesses, dtype="datetime64[us]")
+        ) // np.timedelta64(1, "D")
+        access_penalty = np.minimum(0.5, days_since_access * 0.01)
 
-            # Calculate new importance
-            new_importance = memory.importance * (1 - decay_rate - access_penalty)
-            new_importance = max(0.05, new_importance)  # Minimum importance threshold
+        # Calculate new importance
+        new_importances = np.array(importances, dtype=np.float64) * (
+            1 - decay_rates - access_penalty
+        )
+        new_importances = np.maximum(0.05, new_importances)  # Minimum threshold
 
-            await self.memory_repo.update(memory.id, importance=new_importance)
+        return [
+            {"id": memory_id, "importance": importance}
+            for memory_id, importance in zip(ids, new_importances.tolist())
+        ]
 
     def _classify_memory_type(self, experience_data: Dict[str, Any]) -> str:
         """Classify the type of memory based on experience data."""
-
-        # Check for specific event types
-        if "user_interaction" in experience_data.get("source", ""):
-            return "episodic"
-
-        if "learning" in experience_data.get("type", ""):
-            return "procedural"
-
-        if "fact" in experience_data.get(
-            "type", ""
-        ) or "knowledge" in experience_data.get("type", ""):
-            return "semantic"
-
-        # Default classification based on content
-        content_type = experience_data.get("event_type", "").lower()
-
-        if content_type in ["user_query", "conversation", "interaction"]:
-            return "episodic"
-        elif content_type in [
-            "learning_update",
-            "behavior_change",
-            "skill_acquisition",
-        ]:
-            return "procedural"
-        else:
-            return "semantic"
+        return _memory_type_for(
+            experience_data.get("source", ""),
+            experience_data.get("type", ""),
+            experience_data.get("event_type", ""),
+        )
 
     async def _calculate_importance(
-        self, experience_data: Dict[str, Any], emotional_state: Optional[EmotionalState]
+        self,
+        experience_data: Dict[str, Any],
+        emotional_state: Optional[EmotionalState],
+        category: str,
     ) -> float:
         """Calculate the importance score for a memory."""
 
-        importance_factors = {}
+        # Both similarity counts come from a single query
+        category_count, event_type_count = await self._count_similar_memories(
+            experience_data, category
+        )
+
+        return self._score_importance(
+            experience_data, emotional_state, category_count, event_type_count
+        )
+
+    def _score_importance(
+        self,
+        experience_data: Dict[str, Any],
+        emotional_state: Optional[EmotionalState],
+        category_count: int,
+        event_type_count: int,
+    ) -> float:
+        """Weigh the importance factors once the similarity counts are known."""
 
         # Emotional impact
-        if emotional_state:
-            importance_factors["emotional_impact"] = emotional_state.intensity
-        else:
-            importance_factors["emotional_impact"] = 0.5
+        emotional_impact = emotional_state.intensity if emotional_state else 0.5
 
         # Novelty (how unique is this experience)
-        importance_factors["novelty"] = await self._calculate_novelty(experience_data)
+        novelty = self._calculate_novelty(category_count)
 
         # Relevance (how relevant to current goals/context)
-        importance_factors["relevance"] = self._calculate_relevance(experience_data)
+        relevance = self._calculate_relevance(experience_data)
 
         # Frequency (how often do we see this type of experience)
-        importance_factors["frequency"] = await self._calculate_frequency_impact(
-            experience_data
-        )
+        frequency = self._calculate_frequency_impact(event_type_count)
 
         # Recency (more recent experiences are more important initially)
-        importance_factors["recency"] = 1.0  # New memories start with full recency
-
-        # Calculate weighted importance
-        total_importance = 0.0
-        for factor, value in importance_factors.items():
-            weight = self.importance_weights.get(factor, 0.0)
-            total_importance += value * weight
+        recency = 1.0  # New memories start with full recency
+
+        # Calculate weighted importance, summed in the same factor order
+        weights = self.importance_weights
+        total_importance = (
+            emotional_impact * weights.get("emotional_impact", 0.0)
+            + novelty * weights.get("novelty", 0.0)
+            + relevance * weights.get("relevance", 0.0)
+            + frequency * weights.get("frequency", 0.0)
+            + recency * weights.get("recency", 0.0)
+        )
 
         return min(1.0, max(0.1, total_importance))
 
-    async def _calculate_novelty(self, experience_data: Dict[str, Any]) -> float:
-        """Calculate how novel this experience is."""
+    async def _count_similar_memories(
+        self, experience_data: Dict[str, Any], category: str
+    ) -> Tuple[int, int]:
+        """Count recent memories sharing this experience's category and event type."""
 
-        # Look for similar experiences in recent memory
-        category = self._determine_memory_category(experience_data)
+        event_type = experience_data.get("event_type", "")
 
-        recent_similar = await self.session.execute(
-            select(func.count(Memory.id)).where(
-                and_(
-                    Memory.category == category,
-                    Memory.created_at >= datetime.utcnow() - timedelta(days=7),
-                )
-            )
+        now = datetime.utcnow()
+        week_ago = now - timedelta(days=7)
+
+        # Conditional counts over the wider 30 day window
+        counts = await self.session.execute(
+            select(
+                func.count(
+                    case(
+                        (
+                            and_(
+                                Memory.category == category,
+                                Memory.created_at >= week_ago,
+                            ),
+                            1,
+                        )
+                    )
+                ),
+                func.count(case((Memory.event_type == event_type, 1))),
+            ).where(Memory.created_at >= now - timedelta(days=30))
         )
 
-        similar_count = recent_similar.scalar()
+        category_count, event_type_count = counts.one()
+        return category_count, event_type_count
+
+    def _calculate_novelty(self, similar_count: int) -> float:
+        """Calculate how novel this experience is."""
 
         # Higher novelty if fewer similar experiences
         novelty = 1.0 - min(0.9, similar_count * 0.1)
@@ -520,25 +838,9 @@ def _calculate_relevance(self, experience_data: Dict[str, Any]) -> float:
 
         return min(1.0, relevance_score)
 
-    async def _calculate_frequency_impact(
-        self, experience_data: Dict[str, Any]
-    ) -> float:
+    def _calculate_frequency_impact(self, count: int) -> float:
         """Calculate importance based on frequency of similar experiences."""
 
-        event_type = experience_data.get("event_type", "")
-
-        # Count similar events in recent history
-        recent_count = await self.session.execute(
-            select(func.count(Memory.id)).where(
-                and_(
-                    func.json_extract(Memory.content, "$.event_type") == event_type,
-                    Memory.created_at >= datetime.utcnow() - timedelta(days=30),
-                )
-            )
-        )
-
-        count = recent_count.scalar()
-
         # Rare events are more important, but very common events might also be important
         if count == 0:
             return 0.9  # Very rare
@@ -557,26 +859,15 @@ def _determine_memory_category(self, experience_data: Dict[str, Any]) -> str:
             return experience_data["category"]
 
         # Infer from event type
-        event_type = experience_data.get("event_type", "").lower()
-
-        if "user" in event_type:
-            return "user_interaction"
-        elif "device" in event_type:
-            return "device_management"
-        elif "sensor" in event_type:
-            return "environmental_monitoring"
-        elif "system" in event_type:
-            return "system_operation"
-        elif "learning" in event_type:
-            return "learning_experience"
-        else:
-            return "general"
+        return _category_for_event_type(experience_data.get("event_type", ""))
 
-    def _generate_memory_title(self, experience_data: Dict[str, Any]) -> str:
+    def _generate_memory_title(
+        self, experience_data: Dict[str, Any], now: datetime
+    ) -> str:
         """Generate a title for the memory."""
 
         event_type = experience_data.get("event_type", "Experience")
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M")
+        timestamp = now.strftime("%Y-%m-%d %H:%M")
 
         # Create descriptive title
         if "user_query" in event_type:
@@ -615,7 +906,9 @@ def _generate_memory_description(self, experience_data: Dict[str, Any]) -> str:
 
         return ". ".join(description_parts) + "."
 
-    def _extract_tags(self, experience_data: Dict[str, Any]) -> List[str]:
+    def _extract_tags(
+        self, experience_data: Dict[str, Any], category: str, now: datetime
+    ) -> List[str]:
         """Extract tags from experience data."""
 
         tags = []
@@ -625,7 +918,6 @@ def _extract_tags(self, experience_data: Dict[str, Any]) -> List[str]:
             tags.append(experience_data["event_type"])
 
         # Add category as tag
-        category = self._determine_memory_category(experience_data)
         tags.append(category)
 
         # Add severity as tag if present
@@ -637,16 +929,15 @@ def _extract_tags(self, experience_data: Dict[str, Any]) -> List[str]:
             tags.append(f"outcome_{experience_data['outcome']}")
 
         # Add time-based tags
-        now = datetime.utcnow()
         tags.extend(
             [
                 f"hour_{now.hour}",
-                f"day_{now.strftime('%A').lower()}",
-                f"month_{now.strftime('%B').lower()}",
+                f"day_{_WEEKDAYS[now.weekday()]}",
+                f"month_{_MONTHS[now.month - 1]}",
             ]
         )
 
-        return list(set(tags))  # Remove duplicates
+        return list(dict.fromkeys(tags))  # Remove duplicates, keeping order
 
     def _extract_related_entities(self, experience_data: Dict[str, Any]) -> List[str]:
         """Extract related entities from experience data."""
@@ -669,9 +960,9 @@ def _extract_related_entities(self, experience_data: Dict[str, Any]) -> List[str
         if "sensor_type" in experience_data:
             entities.append(f"sensor_{experience_data['sensor_type']}")
 
-        return list(set(entities))  # Remove duplicates
+        return list(dict.fromkeys(entities))  # Remove duplicates, keeping order
 
-    async def _create_experience_record(
+    def _create_experience_record(
         self,
         memory: Memory,
         emotional_state: EmotionalState,
@@ -706,9 +997,8 @@ async def _create_experience_record(
         )
 
         self.session.add(experience)
-        await self.session.commit()
 
-    async def _calculate_context_relevance(
+    def _calculate_context_relevance(
         self, memory: Memory, context: Dict[str, Any]
     ) -> float:
         """Calculate how relevant a memory is to the current context."""
@@ -744,3 +1034,41 @@ async def _calculate_context_relevance(
         relevance_score += recency_bonus * 0.1
 
         return min(1.0, relevance_score)
+
+    def _context_relevance_expression(
+        self, context: Dict[str, Any]
+    ) -> ColumnElement[float]:
+        """Build _calculate_context_relevance as a SQL expression for ranking."""
+
+        relevance_score = literal(0.5)  # Base relevance
+
+        # Tag overlap, matching quoted items in the serialized JSON array
+        context_keys = set(context.keys())
+        if context_keys:
+            relevance_score += (
+                _json_array_matches(Memory.tags, context_keys)
+                / float(len(context_keys))
+            ) * 0.3
+
+        # Entity overlap
+        if "entities" in context:
+            context_entities = set(context["entities"])
+            if context_entities:
+                relevance_score += (
+                    _json_array_matches(Memory.related_entities, context_entities)
+                    / float(len(context_entities))
+                ) * 0.2
+
+        # Recency bonus
+        hours_since_created = (
+            literal(time.time()) - extract("epoch", Memory.created_at)
+        ) / 3600.0
+        relevance_score += (
+            case(
+                (hours_since_created < 168, 1 - hours_since_created / 168.0),
+                else_=0.0,
+            )
+            * 0.1
+        )  # Decay over a week
+
+        return case((relevance_score > 1.0, 1.0), else_=relevance_score)
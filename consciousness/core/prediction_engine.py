@@ -1,22 +1,136 @@
 import asyncio
+import math
+import time
+from array import array
+from collections import Counter
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import combinations, count
+from operator import attrgetter
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
 
 import numpy as np
 from sqlalchemy import and_, func, or_, select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from ..models.consciousness import EmotionalState, Experience, Memory
 from ..models.entities import Device
 from ..models.events import ControlAction, Event, SensorReading
 from ..repositories.consciousness import EmotionalStateRepository, MemoryRepository
 
+# Emotions tracked for trend and stability predictions, in column order
+_EMOTIONS = ("happiness", "worry", "boredom", "excitement")
+_emotion_values = attrgetter(*_EMOTIONS)
+
+# Event types the system performance predictions read
+_SYSTEM_EVENT_TYPES = ("system_status", "performance_metric", "resource_usage")
+
+# Interaction strength between prediction types, listed in both orders
+_INTERACTION_STRENGTHS = {
+    ("user_behavior", "emotional_state"): 0.8,
+    ("environmental", "system_performance"): 0.6,
+    ("device_status", "system_performance"): 0.7,
+    ("user_behavior", "device_status"): 0.5,
+    ("environmental", "emotional_state"): 0.4,
+}
+_INTERACTION_STRENGTHS.update(
+    {
+        (type2, type1): strength
+        for (type1, type2), strength in _INTERACTION_STRENGTHS.items()
+    }
+)
+
+
+@dataclass(slots=True)
+class SensorSeries:
+    """Column-oriented readings of one sensor type, in reading order."""
+
+    values: np.ndarray  # float64 reading values
+    offsets: np.ndarray  # float64 seconds since the first reading
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+@dataclass(slots=True)
+class SensorStats:
+    """Moments of one sensor series, shared by the trend and anomaly predictors."""
+
+    mean: float
+    deviations: np.ndarray  # float64 values minus the mean
+    sum_squares: float  # total sum of squared deviations
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.sum_squares / len(self.deviations))
+
+
+def _sensor_stats(values: np.ndarray) -> SensorStats:
+    """Return the mean and deviations of sensor values in one pass each."""
+
+    mean = float(values.mean())
+    deviations = values - mean
+    return SensorStats(
+        mean=mean,
+        deviations=deviations,
+        sum_squares=float(np.dot(deviations, deviations)),
+    )
+
+
+def _population_std(values: List[float]) -> float:
+    """Return the population standard deviation of a handful of floats."""
+
+    mean = sum(values) / len(values)
+    variance = 0.0
+    for value in values:
+        deviation = value - mean
+        variance += deviation * deviation
+
+    return math.sqrt(variance / len(values))
+
+
+def _confidence_stats(confidences: List[float]) -> Tuple[float, float, float]:
+    """Return the geometric mean, minimum and population standard deviation.
+
+    The inputs are a handful of per-type confidences, so plain float math
+    beats three NumPy reductions and their array conversions. The
+    geometric mean is taken in log space, which cannot underflow however
+    many confidences are combined.
+    """
+
+    lowest = min(confidences)
+    if lowest > 0:
+        geometric_mean = math.exp(
+            math.fsum(map(math.log, confidences)) / len(confidences)
+        )
+    else:
+        geometric_mean = 0.0
+
+    return geometric_mean, lowest, _population_std(confidences)
+
 
 class PredictionEngine:
     """Manages future state prediction, anticipation, and scenario modeling."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        sessionmaker: Optional[async_sessionmaker] = None,
+    ):
         self.session = session
+        # Optional factory for read-only queries run on their own
+        # connections; without it they share ``session`` one at a time
+        self.sessionmaker = sessionmaker
         self.memory_repo = MemoryRepository(session)
         self.emotion_repo = EmotionalStateRepository(session)
 
@@ -54,6 +168,23 @@ def __init__(self, session: AsyncSession):
             },
         }
 
+        # Horizon of each prediction type in seconds, as predictions report it
+        self._type_horizon_seconds = {
+            prediction_type: config["horizon"].total_seconds()
+            for prediction_type, config in self.prediction_types.items()
+        }
+
+        # Predictor for each prediction type
+        self._type_predictors: Dict[
+            str, Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]
+        ] = {
+            "user_behavior": self._predict_user_behavior,
+            "environmental": self._predict_environmental_conditions,
+            "system_performance": self._predict_system_performance,
+            "device_status": self._predict_device_status,
+            "emotional_state": self._predict_emotional_state,
+        }
+
         # Prediction algorithms
         self.algorithms = {
             "temporal_pattern": {
@@ -95,21 +226,91 @@ def __init__(self, session: AsyncSession):
         # Active predictions cache
         self.active_predictions = {}
 
+        # Time and accepted prediction (or None) of each type's last run
+        self._type_results: Dict[str, Tuple[datetime, Optional[Dict[str, Any]]]] = {}
+
+        # Prediction memories queued during a cycle, inserted together
+        self._pending_memories: List[Memory] = []
+
+        # Sequence number that keeps ids issued in the same instant distinct
+        self._prediction_sequence = count()
+
+        # Recent control actions grouped by device, keyed by (hours, cutoff hour)
+        self._actions_cache: Optional[
+            Tuple[Tuple[int, datetime], Dict[int, List[ControlAction]], float]
+        ] = None
+
+        # User and system events shared by the predictors, fetched together
+        # and reused for the shortest prediction update interval
+        self.interaction_window = timedelta(days=14)
+        self.system_event_window = timedelta(hours=24)
+        self.event_window_ttl = min(
+            config["update_frequency"] for config in self.prediction_types.values()
+        ).total_seconds()
+        self._event_window: Optional[Tuple[float, List[Event]]] = None
+        self._event_window_lock = asyncio.Lock()
+
+        # Sensor rows fetched per partition when streaming readings
+        self.sensor_batch_size = 5000
+
         # Prediction horizon limits
         self.max_horizon = timedelta(days=30)
         self.min_horizon = timedelta(minutes=15)
 
     async def generate_predictions(self) -> List[Dict[str, Any]]:
-        """Generate predictions for all configured prediction types."""
+        """Generate predictions for all configured prediction types.
 
+        A type whose last result is younger than its ``update_frequency``
+        reuses that result instead of being predicted again.
+        """
+
+        now = datetime.utcnow()
         predictions = []
 
-        # Generate predictions for each type
+        fresh_results = {}
+        due_types = []
         for prediction_type, config in self.prediction_types.items():
+            last_result = self._type_results.get(prediction_type)
+            if last_result and now - last_result[0] < config["update_frequency"]:
+                fresh_results[prediction_type] = last_result[1]
+            else:
+                due_types.append((prediction_type, config))
+
+        # Generate predictions for each due type
+        if self.sessionmaker is not None:
+            # Every type reads on its own sessions, so overlap them
+            results = await asyncio.gather(
+                *(
+                    self._generate_type_prediction(prediction_type, config)
+                    for prediction_type, config in due_types
+                ),
+                return_exceptions=True,
+            )
+        else:
+            results = []
+            for prediction_type, config in due_types:
+                try:
+                    results.append(
+                        await self._generate_type_prediction(prediction_type, config)
+                    )
+                except Exception as e:
+                    results.append(e)
+        results = dict(
+            zip((prediction_type for prediction_type, _ in due_types), results)
+        )
+
+        for prediction_type, config in self.prediction_types.items():
+            if prediction_type in fresh_results:
+                if fresh_results[prediction_type]:
+                    predictions.append(fresh_results[prediction_type])
+                continue
+
+            prediction = results[prediction_type]
+            if isinstance(prediction, Exception):
+                print(f"Error generating {prediction_type} prediction: {prediction}")
+                continue
+
             try:
-                prediction = await self._generate_type_prediction(
-                    prediction_type, config
-                )
                 if (
                     prediction
                     and prediction["confidence"] >= config["confidence_threshold"]
@@ -117,12 +318,22 @@ async def generate_predictions(self) -> List[Dict[str, Any]]:
                     predictions.append(prediction)
                     self.active_predictions[prediction_type] = prediction
 
-                    # Store prediction as memory
-                    await self._store_prediction_memory(prediction)
+                    # Queue prediction as memory
+                    self._queue_prediction_memory(prediction)
+                else:
+                    prediction = None
+
+                self._type_results[prediction_type] = (now, prediction)
 
             except Exception as e:
                 print(f"Error generating {prediction_type} prediction: {e}")
 
+        # Store the accepted predictions as memories with a single commit
+        try:
+            await self._flush_prediction_memories()
+        except Exception as e:
+            print(f"Error storing prediction memories: {e}")
+
         # Generate cross-type scenario predictions
         scenario_predictions = await self._generate_scenario_predictions(predictions)
         predictions.extend(scenario_predictions)
@@ -160,54 +371,57 @@ async def predict_specific_event(
             prediction["probability"] = 0.1
             return prediction
 
+        # The estimators below are plain computation over the fetched rows,
+        # so they run inline rather than as separately awaited coroutines
+        now = datetime.utcnow()
+        avg_interval = self._average_event_interval(historical_data)
+
         # Calculate probability using multiple approaches
         probability_estimates = []
 
         # Temporal pattern analysis
-        temporal_prob = await self._calculate_temporal_probability(
-            historical_data, horizon, context
+        temporal_prob = self._calculate_temporal_probability(
+            historical_data, avg_interval, now
         )
         probability_estimates.append(temporal_prob)
 
         # Contextual similarity analysis
-        contextual_prob = await self._calculate_contextual_probability(
+        contextual_prob = self._calculate_contextual_probability(
             historical_data, context
         )
         probability_estimates.append(contextual_prob)
 
         # Trend analysis
-        trend_prob = await self._calculate_trend_probability(historical_data, horizon)
+        trend_prob = self._calculate_trend_probability(historical_data, now)
         probability_estimates.append(trend_prob)
 
         # Combine probabilities
-        prediction["probability"] = np.mean(probability_estimates)
+        prediction["probability"] = (temporal_prob + contextual_prob + trend_prob) / 3
 
         # Predict timing if probability is significant
         if prediction["probability"] > 0.3:
-            predicted_time = await self._predict_event_timing(
-                historical_data, horizon, context
+            predicted_time = self._predict_event_timing(
+                historical_data, avg_interval, horizon, now
             )
             prediction["predicted_time"] = (
                 predicted_time.isoformat() if predicted_time else None
             )
 
         # Calculate confidence
-        prediction["confidence"] = await self._calculate_event_prediction_confidence(
+        prediction["confidence"] = self._calculate_event_prediction_confidence(
             prediction, historical_data, probability_estimates
         )
 
         # Identify influencing factors
-        prediction["influencing_factors"] = await self._identify_influencing_factors(
+        prediction["influencing_factors"] = self._identify_influencing_factors(
             event_type, historical_data, context
         )
 
         # Assess risk level
-        prediction["risk_level"] = await self._assess_event_risk_level(
-            prediction, event_type
-        )
+        prediction["risk_level"] = self._assess_event_risk_level(prediction, event_type)
 
         # Generate recommendations
-        prediction["recommended_actions"] = await self._generate_event_recommendations(
+        prediction["recommended_actions"] = self._generate_event_recommendations(
             prediction
         )
 
@@ -302,10 +516,14 @@ async def _generate_type_prediction(
     ) -> Optional[Dict[str, Any]]:
         """Generate prediction for a specific type."""
 
+        predictor = self._type_predictors.get(prediction_type)
+        if predictor is None:
+            return None
+
         prediction = {
-            "prediction_id": f"pred_{prediction_type}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}",
+            "prediction_id": self._new_prediction_id(f"pred_{prediction_type}"),
             "prediction_type": prediction_type,
-            "horizon": config["horizon"].total_seconds(),
+            "horizon": self._type_horizon_seconds[prediction_type],
             "confidence": 0.0,
             "predictions": [],
             "methodology": [],
@@ -314,24 +532,18 @@ async def _generate_type_prediction(
             "created_at": datetime.utcnow().isoformat(),
         }
 
-        if prediction_type == "user_behavior":
-            result = await self._predict_user_behavior(config)
-        elif prediction_type == "environmental":
-            result = await self._predict_environmental_conditions(config)
-        elif prediction_type == "system_performance":
-            result = await self._predict_system_performance(config)
-        elif prediction_type == "device_status":
-            result = await self._predict_device_status(config)
-        elif prediction_type == "emotional_state":
-            result = await self._predict_emotional_state(config)
-        else:
-            return None
+        result = await predictor(config)
 
         if result:
             prediction.update(result)
 
         return prediction if prediction["confidence"] > 0.1 else None
 
+    def _new_prediction_id(self, prefix: str) -> str:
+        """Return a unique prediction id from the clock and a sequence number."""
+
+        return f"{prefix}_{time.time_ns():x}_{next(self._prediction_sequence)}"
+
     async def _predict_user_behavior(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Predict user behavior patterns."""
 
@@ -380,23 +592,23 @@ async def _predict_environmental_conditions(
     ) -> Dict[str, Any]:
         """Predict environmental conditions."""
 
-        # Get recent sensor data
-        sensor_data = await self._get_recent_sensor_data(hours=48)
+        # Get recent sensor data, grouped by sensor type
+        sensor_groups = await self._get_recent_sensor_series(hours=48)
 
-        if not sensor_data:
+        if not sensor_groups:
             return {"confidence": 0.1, "predictions": []}
 
         predictions = []
         methodology = []
 
-        # Group by sensor type
-        sensor_groups = self._group_sensor_data(sensor_data)
+        for sensor_type, series in sensor_groups.items():
+            if len(series) >= 10:
+                # Both predictors work from the same moments of the series
+                stats = _sensor_stats(series.values)
 
-        for sensor_type, readings in sensor_groups.items():
-            if len(readings) >= 10:
                 # Predict trend continuation
                 trend_prediction = await self._predict_sensor_trend(
-                    sensor_type, readings, config["horizon"]
+                    sensor_type, series, stats, config["horizon"]
                 )
                 if trend_prediction:
                     predictions.append(trend_prediction)
@@ -404,7 +616,7 @@ async def _predict_environmental_conditions(
 
                 # Predict anomalies
                 anomaly_prediction = await self._predict_sensor_anomalies(
-                    sensor_type, readings, config["horizon"]
+                    sensor_type, series, stats, config["horizon"]
                 )
                 if anomaly_prediction:
                     predictions.append(anomaly_prediction)
@@ -416,11 +628,11 @@ async def _predict_environmental_conditions(
         )
         predictions.extend(env_events)
         methodology.extend(
-            [f"Environmental event correlation analysis" for _ in env_events]
+            ["Environmental event correlation analysis"] * len(env_events)
         )
 
         # Calculate confidence based on data quality and quantity
-        data_quality = sum(len(readings) for readings in sensor_groups.values()) / len(
+        data_quality = sum(len(series) for series in sensor_groups.values()) / len(
             sensor_groups
         )
         confidence = min(1.0, data_quality / 20) if sensor_groups else 0.1
@@ -437,8 +649,10 @@ async def _predict_system_performance(
         """Predict system performance metrics."""
 
         # Get recent system events and performance data
-        system_events = await self._get_recent_system_events(hours=24)
-        control_actions = await self._get_recent_control_actions(hours=12)
+        system_events, control_actions = await self._gather_reads(
+            self._get_recent_system_events(hours=24),
+            self._get_recent_control_actions(hours=12),
+        )
 
         predictions = []
         methodology = []
@@ -486,17 +700,20 @@ async def _predict_system_performance(
     async def _predict_device_status(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """Predict device health and status changes."""
 
-        # Get device information and recent activity
-        devices = await self._get_all_devices()
-        recent_actions = await self._get_recent_control_actions(hours=72)
+        # Get device information and recent activity, grouped once per device
+        devices, (actions_by_device, window_hours) = await self._gather_reads(
+            self._get_all_devices(), self._get_control_actions_by_device(hours=72)
+        )
 
         predictions = []
         methodology = []
 
         for device in devices:
+            device_actions = actions_by_device.get(device.id, [])
+
             # Predict device health decline
             health_prediction = await self._predict_device_health(
-                device, recent_actions, config["horizon"]
+                device, device_actions, config["horizon"]
             )
             if health_prediction:
                 predictions.append(health_prediction)
@@ -504,7 +721,7 @@ async def _predict_device_status(self, config: Dict[str, Any]) -> Dict[str, Any]
 
             # Predict maintenance needs
             maintenance_prediction = await self._predict_device_maintenance(
-                device, recent_actions, config["horizon"]
+                device, device_actions, window_hours, config["horizon"]
             )
             if maintenance_prediction:
                 predictions.append(maintenance_prediction)
@@ -512,7 +729,7 @@ async def _predict_device_status(self, config: Dict[str, Any]) -> Dict[str, Any]
 
             # Predict usage patterns
             usage_prediction = await self._predict_device_usage(
-                device, recent_actions, config["horizon"]
+                device, device_actions, config["horizon"]
             )
             if usage_prediction:
                 predictions.append(usage_prediction)
@@ -530,7 +747,7 @@ async def _predict_emotional_state(self, config: Dict[str, Any]) -> Dict[str, An
         """Predict emotional state evolution."""
 
         # Get recent emotional states
-        recent_states = await self.emotion_repo.get_state_history(hours=24)
+        recent_states = await self._get_emotional_state_history(hours=24)
 
         if len(recent_states) < 3:
             return {"confidence": 0.1, "predictions": []}
@@ -538,9 +755,15 @@ async def _predict_emotional_state(self, config: Dict[str, Any]) -> Dict[str, An
         predictions = []
         methodology = []
 
+        # One row per state and one column per emotion, shared by the
+        # trend and stability predictions
+        emotion_matrix = np.array(
+            [_emotion_values(state) for state in recent_states], dtype=np.float64
+        )
+
         # Predict emotional trend continuation
         trend_prediction = await self._predict_emotional_trends(
-            recent_states, config["horizon"]
+            emotion_matrix, config["horizon"]
         )
         if trend_prediction:
             predictions.append(trend_prediction)
@@ -548,7 +771,7 @@ async def _predict_emotional_state(self, config: Dict[str, Any]) -> Dict[str, An
 
         # Predict emotional stability
         stability_prediction = await self._predict_emotional_stability(
-            recent_states, config["horizon"]
+            emotion_matrix, config["horizon"]
         )
         if stability_prediction:
             predictions.append(stability_prediction)
@@ -580,12 +803,17 @@ async def _generate_scenario_predictions(
         if len(base_predictions) < 2:
             return scenarios
 
-        # Generate interaction scenarios
-        for i, pred1 in enumerate(base_predictions):
-            for j, pred2 in enumerate(base_predictions[i + 1 :], i + 1):
-                scenario = await self._generate_interaction_scenario(pred1, pred2)
-                if scenario and scenario["confidence"] > 0.4:
-                    scenarios.append(scenario)
+        # Generate interaction scenarios, only for pairs that interact enough
+        for pred1, pred2 in combinations(base_predictions, 2):
+            interaction_strength = self._calculate_interaction_strength(pred1, pred2)
+            if interaction_strength < 0.3:
+                continue
+
+            scenario = await self._generate_interaction_scenario(
+                pred1, pred2, interaction_strength
+            )
+            if scenario["confidence"] > 0.4:
+                scenarios.append(scenario)
 
         # Generate compound scenarios
         if len(base_predictions) >= 3:
@@ -596,12 +824,12 @@ async def _generate_scenario_predictions(
         return scenarios
 
     async def _generate_interaction_scenario(
-        self, pred1: Dict[str, Any], pred2: Dict[str, Any]
-    ) -> Optional[Dict[str, Any]]:
+        self, pred1: Dict[str, Any], pred2: Dict[str, Any], interaction_strength: float
+    ) -> Dict[str, Any]:
         """Generate a scenario from interaction between two predictions."""
 
         scenario = {
-            "prediction_id": f"scenario_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}",
+            "prediction_id": self._new_prediction_id("scenario"),
             "prediction_type": "interaction_scenario",
             "primary_predictions": [pred1["prediction_id"], pred2["prediction_id"]],
             "scenario_description": "",
@@ -612,12 +840,6 @@ async def _generate_interaction_scenario(
             "created_at": datetime.utcnow().isoformat(),
         }
 
-        # Analyze interaction potential
-        interaction_strength = await self._calculate_interaction_strength(pred1, pred2)
-
-        if interaction_strength < 0.3:
-            return None
-
         # Generate scenario description
         scenario["scenario_description"] = await self._generate_scenario_description(
             pred1, pred2, interaction_strength
@@ -647,7 +869,7 @@ async def _generate_compound_scenario(
         """Generate a compound scenario from multiple predictions."""
 
         scenario = {
-            "prediction_id": f"compound_{datetime.utcnow().strftime('%Y%m%d_%H%M%S_%f')}",
+            "prediction_id": self._new_prediction_id("compound"),
             "prediction_type": "compound_scenario",
             "component_predictions": [p["prediction_id"] for p in predictions],
             "scenario_description": "",
@@ -660,19 +882,17 @@ async def _generate_compound_scenario(
         }
 
         # Calculate compound likelihood
-        individual_confidences = [p["confidence"] for p in predictions]
-        scenario["likelihood"] = np.prod(individual_confidences) ** (
-            1 / len(individual_confidences)
+        likelihood, lowest, spread = _confidence_stats(
+            [p["confidence"] for p in predictions]
         )
-        scenario["confidence"] = min(individual_confidences) * 0.7
+        scenario["likelihood"] = likelihood
+        scenario["confidence"] = lowest * 0.7
 
         if scenario["confidence"] < 0.3:
             return None
 
         # Calculate complexity
-        scenario["complexity_score"] = len(predictions) * 0.2 + np.std(
-            individual_confidences
-        )
+        scenario["complexity_score"] = len(predictions) * 0.2 + spread
 
         # Generate description
         scenario["scenario_description"] = await self._generate_compound_description(
@@ -692,99 +912,231 @@ async def _generate_compound_scenario(
     async def _get_historical_event_data(
         self, event_type: str, days: int
     ) -> List[Event]:
-        """Get historical data for a specific event type."""
+        """Get (created_at, event_data) rows for a specific event type."""
 
         cutoff_time = datetime.utcnow() - timedelta(days=days)
 
-        result = await self.session.execute(
-            select(Event)
+        result = await self._execute_read(
+            select(Event.created_at, Event.event_data)
             .where(
                 and_(Event.event_type == event_type, Event.created_at >= cutoff_time)
             )
             .order_by(Event.created_at.asc())
         )
 
-        return result.scalars().all()
+        return result.all()
+
+    async def _fetch_event_window(self) -> List[Event]:
+        """Get recent user interactions and system events in one query.
+
+        Rows carry only event_type, severity, created_at and event_data.
+        They are reused for ``event_window_ttl`` seconds, so the predictors
+        of one update interval filter them in memory instead of each
+        querying the events table.
+        """
+
+        async with self._event_window_lock:
+            if self._event_window is not None:
+                fetched_at, events = self._event_window
+                if time.monotonic() - fetched_at < self.event_window_ttl:
+                    return events
+
+            now = datetime.utcnow()
+            result = await self._execute_read(
+                select(
+                    Event.event_type,
+                    Event.severity,
+                    Event.created_at,
+                    Event.event_data,
+                )
+                .where(
+                    or_(
+                        and_(
+                            Event.event_type == "user_query",
+                            Event.created_at >= now - self.interaction_window,
+                        ),
+                        and_(
+                            Event.event_type.in_(_SYSTEM_EVENT_TYPES),
+                            Event.created_at >= now - self.system_event_window,
+                        ),
+                    )
+                )
+                .order_by(Event.created_at.asc())
+            )
+            events = result.all()
+
+            self._event_window = (time.monotonic(), events)
+            return events
 
     async def _get_recent_user_interactions(self, days: int) -> List[Event]:
-        """Get recent user interaction events."""
+        """Get recent user interaction events, up to ``interaction_window``."""
 
         cutoff_time = datetime.utcnow() - timedelta(days=days)
 
-        result = await self.session.execute(
-            select(Event)
-            .where(
-                and_(Event.event_type == "user_query", Event.created_at >= cutoff_time)
-            )
-            .order_by(Event.created_at.asc())
-        )
+        return [
+            event
+            for event in await self._fetch_event_window()
+            if event.event_type == "user_query" and event.created_at >= cutoff_time
+        ]
 
-        return result.scalars().all()
+    async def _get_recent_sensor_series(self, hours: int) -> Dict[str, SensorSeries]:
+        """Stream recent sensor readings into per-type value and offset columns.
 
-    async def _get_recent_sensor_data(self, hours: int) -> List[SensorReading]:
-        """Get recent sensor readings."""
+        Rows arrive in ``sensor_batch_size`` partitions and are appended to
+        typed buffers, so neither ORM instances nor a list of every row are
+        held while grouping.
+        """
 
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
 
-        result = await self.session.execute(
-            select(SensorReading)
+        statement = (
+            select(
+                SensorReading.sensor_type,
+                SensorReading.value,
+                SensorReading.reading_time,
+            )
             .where(SensorReading.reading_time >= cutoff_time)
             .order_by(SensorReading.reading_time.asc())
+            .execution_options(yield_per=self.sensor_batch_size)
         )
 
-        return result.scalars().all()
+        # sensor_type -> (first reading time, values, seconds since first)
+        buffers: Dict[str, Tuple[datetime, array, array]] = {}
+        async with self._read_session() as session:
+            readings = await session.stream(statement)
+            async for rows in readings.partitions():
+                for sensor_type, value, reading_time in rows:
+                    buffer = buffers.get(sensor_type)
+                    if buffer is None:
+                        buffer = buffers[sensor_type] = (
+                            reading_time,
+                            array("d"),
+                            array("d"),
+                        )
+                    buffer[1].append(value)
+                    buffer[2].append((reading_time - buffer[0]).total_seconds())
+
+        return {
+            sensor_type: SensorSeries(
+                values=np.frombuffer(values, dtype=np.float64),
+                offsets=np.frombuffer(offsets, dtype=np.float64),
+            )
+            for sensor_type, (_, values, offsets) in buffers.items()
+        }
 
     async def _get_recent_system_events(self, hours: int) -> List[Event]:
-        """Get recent system events."""
+        """Get recent system events, up to ``system_event_window``."""
 
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
 
-        result = await self.session.execute(
-            select(Event)
-            .where(
-                and_(
-                    Event.created_at >= cutoff_time,
-                    Event.event_type.in_(
-                        ["system_status", "performance_metric", "resource_usage"]
-                    ),
-                )
-            )
-            .order_by(Event.created_at.asc())
-        )
-
-        return result.scalars().all()
+        return [
+            event
+            for event in await self._fetch_event_window()
+            if event.event_type in _SYSTEM_EVENT_TYPES
+            and event.created_at >= cutoff_time
+        ]
 
     async def _get_recent_control_actions(self, hours: int) -> List[ControlAction]:
-        """Get recent control actions."""
+        """Get recent (device_id, status, executed_at) control action rows."""
 
         cutoff_time = datetime.utcnow() - timedelta(hours=hours)
 
-        result = await self.session.execute(
-            select(ControlAction)
+        result = await self._execute_read(
+            select(
+                ControlAction.device_id,
+                ControlAction.status,
+                ControlAction.executed_at,
+            )
             .where(ControlAction.executed_at >= cutoff_time)
             .order_by(ControlAction.executed_at.asc())
         )
 
-        return result.scalars().all()
+        return result.all()
+
+    async def _get_control_actions_by_device(
+        self, hours: int
+    ) -> Tuple[Dict[int, List[ControlAction]], float]:
+        """Get recent control actions grouped by device, with the window span.
+
+        The grouping is reused until the cutoff moves into the next hour.
+        """
+
+        cutoff_hour = (datetime.utcnow() - timedelta(hours=hours)).replace(
+            minute=0, second=0, microsecond=0
+        )
+        if self._actions_cache and self._actions_cache[0] == (hours, cutoff_hour):
+            return self._actions_cache[1], self._actions_cache[2]
+
+        recent_actions = await self._get_recent_control_actions(hours=hours)
+
+        actions_by_device: Dict[int, List[ControlAction]] = {}
+        for action in recent_actions:
+            actions_by_device.setdefault(action.device_id, []).append(action)
+
+        window_hours = (
+            (
+                recent_actions[-1].executed_at - recent_actions[0].executed_at
+            ).total_seconds()
+            / 3600
+            if recent_actions
+            else 0.0
+        )
+
+        self._actions_cache = ((hours, cutoff_hour), actions_by_device, window_hours)
+        return actions_by_device, window_hours
 
     async def _get_all_devices(self) -> List[Device]:
         """Get all devices."""
 
-        result = await self.session.execute(select(Device))
+        result = await self._execute_read(select(Device))
         return result.scalars().all()
 
-    def _group_sensor_data(
-        self, sensor_data: List[SensorReading]
-    ) -> Dict[str, List[SensorReading]]:
-        """Group sensor data by type."""
+    async def _get_emotional_state_history(self, hours: int) -> List[EmotionalState]:
+        """Get recent emotional states, on a short-lived session if available."""
+
+        if self.sessionmaker is None:
+            return await self.emotion_repo.get_state_history(hours=hours)
+
+        async with self.sessionmaker() as session:
+            return await EmotionalStateRepository(session).get_state_history(
+                hours=hours
+            )
+
+    @asynccontextmanager
+    async def _read_session(self) -> AsyncIterator[AsyncSession]:
+        """Yield a short-lived session for reads, or the shared session."""
+
+        if self.sessionmaker is None:
+            yield self.session
+            return
+
+        async with self.sessionmaker() as session:
+            yield session
 
-        groups = {}
-        for reading in sensor_data:
-            if reading.sensor_type not in groups:
-                groups[reading.sensor_type] = []
-            groups[reading.sensor_type].append(reading)
+    async def _execute_read(self, statement: Any) -> Any:
+        """Run a read-only query in its own short-lived session.
 
-        return groups
+        Async session results are fully buffered, so rows remain usable
+        after the session closes. Without a ``sessionmaker`` the query runs
+        on the shared session.
+        """
+
+        async with self._read_session() as session:
+            return await session.execute(statement)
+
+    async def _gather_reads(self, *reads: Awaitable[Any]) -> List[Any]:
+        """Await independent reads, overlapping them when sessions allow.
+
+        With a ``sessionmaker`` every read runs on its own session, so they
+        are gathered; the shared session can only run them one at a time.
+        The predictors themselves are plain computation over the fetched
+        rows, so the reads are the only part worth overlapping.
+        """
+
+        if self.sessionmaker is not None:
+            return list(await asyncio.gather(*reads))
+
+        return [await read for read in reads]
 
     async def _analyze_hourly_patterns(
         self, interactions: List[Event]
@@ -794,12 +1146,18 @@ async def _analyze_hourly_patterns(
         if len(interactions) < 5:
             return None
 
-        hourly_counts = {}
-        for interaction in interactions:
-            hour = interaction.created_at.hour
-            hourly_counts[hour] = hourly_counts.get(hour, 0) + 1
+        hours = np.fromiter(
+            (interaction.created_at.hour for interaction in interactions),
+            dtype=np.intp,
+            count=len(interactions),
+        )
+        counts = np.bincount(hours, minlength=24)
+
+        # Hours in first-seen order, as the peak predictions list them
+        seen, first_index = np.unique(hours, return_index=True)
+        seen = seen[np.argsort(first_index)]
 
-        return hourly_counts
+        return dict(zip(seen.tolist(), counts[seen].tolist()))
 
     async def _predict_peak_interaction_times(
         self, hourly_patterns: Dict[int, int]
@@ -830,13 +1188,13 @@ async def _analyze_interaction_types(
     ) -> Optional[Dict[str, int]]:
         """Analyze interaction type patterns."""
 
-        type_counts = {}
-        for interaction in interactions:
-            if interaction.event_data and "query_type" in interaction.event_data:
-                query_type = interaction.event_data["query_type"]
-                type_counts[query_type] = type_counts.get(query_type, 0) + 1
+        type_counts = Counter(
+            interaction.event_data["query_type"]
+            for interaction in interactions
+            if interaction.event_data and "query_type" in interaction.event_data
+        )
 
-        return type_counts if type_counts else None
+        return dict(type_counts) if type_counts else None
 
     async def _predict_interaction_preferences(
         self, interaction_types: Dict[str, int]
@@ -886,10 +1244,10 @@ async def _predict_user_satisfaction(
             else []
         )
 
-        recent_avg = np.mean(recent_scores)
+        recent_avg = sum(recent_scores) / len(recent_scores)
 
         if older_scores:
-            older_avg = np.mean(older_scores)
+            older_avg = sum(older_scores) / len(older_scores)
             trend = (
                 "improving"
                 if recent_avg > older_avg
@@ -908,24 +1266,31 @@ async def _predict_user_satisfaction(
         }
 
     async def _predict_sensor_trend(
-        self, sensor_type: str, readings: List[SensorReading], horizon: timedelta
+        self,
+        sensor_type: str,
+        series: SensorSeries,
+        stats: SensorStats,
+        horizon: timedelta,
     ) -> Optional[Dict[str, Any]]:
         """Predict sensor value trends."""
 
-        if len(readings) < 5:
+        if len(series) < 5:
             return None
 
-        # Extract values and timestamps
-        values = [r.value for r in readings]
-        timestamps = [
-            (r.reading_time - readings[0].reading_time).total_seconds()
-            for r in readings
-        ]
+        values = series.values
+        timestamps = series.offsets
 
         # Simple linear trend analysis
         if len(values) >= 2:
-            # Calculate slope
-            slope = np.polyfit(timestamps, values, 1)[0]
+            # Least-squares slope from the centred series
+            value_deviations = stats.deviations
+            time_deviations = timestamps - timestamps.mean()
+            time_spread = np.dot(time_deviations, time_deviations)
+            slope = (
+                float(np.dot(time_deviations, value_deviations) / time_spread)
+                if time_spread
+                else 0.0
+            )
 
             # Predict future value
             future_seconds = horizon.total_seconds()
@@ -934,12 +1299,10 @@ async def _predict_sensor_trend(
             # Calculate confidence based on trend consistency
             if len(values) >= 3:
                 # Calculate R-squared for trend quality
-                y_mean = np.mean(values)
-                ss_tot = sum((y - y_mean) ** 2 for y in values)
-                ss_res = sum(
-                    (values[i] - (values[0] + slope * timestamps[i])) ** 2
-                    for i in range(len(values))
-                )
+                ss_tot = stats.sum_squares
+                residuals = values - values[0]
+                residuals -= slope * timestamps
+                ss_res = np.dot(residuals, residuals)
                 r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
                 confidence = max(0.1, min(0.9, r_squared))
             else:
@@ -948,7 +1311,7 @@ async def _predict_sensor_trend(
             return {
                 "type": "sensor_trend",
                 "sensor_type": sensor_type,
-                "current_value": values[-1],
+                "current_value": float(values[-1]),
                 "predicted_value": predicted_value,
                 "trend_direction": "increasing"
                 if slope > 0
@@ -962,23 +1325,24 @@ async def _predict_sensor_trend(
         return None
 
     async def _predict_sensor_anomalies(
-        self, sensor_type: str, readings: List[SensorReading], horizon: timedelta
+        self,
+        sensor_type: str,
+        series: SensorSeries,
+        stats: SensorStats,
+        horizon: timedelta,
     ) -> Optional[Dict[str, Any]]:
         """Predict potential sensor anomalies."""
 
-        if len(readings) < 10:
+        if len(series) < 10:
             return None
 
-        values = [r.value for r in readings]
-
-        # Calculate statistical properties
-        mean_val = np.mean(values)
-        std_val = np.std(values)
+        # Statistical properties come from the shared pre-pass
+        mean_val = stats.mean
+        std_val = stats.std
 
         # Check recent trend for anomaly indicators
-        recent_values = values[-5:]
-        anomaly_indicators = sum(
-            1 for v in recent_values if abs(v - mean_val) > 2 * std_val
+        anomaly_indicators = int(
+            np.count_nonzero(np.abs(stats.deviations[-5:]) > 2 * std_val)
         )
 
         if anomaly_indicators >= 2:  # Multiple recent anomalies suggest pattern
@@ -998,7 +1362,7 @@ async def _predict_sensor_anomalies(
         return None
 
     async def _predict_environmental_events(
-        self, sensor_groups: Dict[str, List[SensorReading]], horizon: timedelta
+        self, sensor_groups: Dict[str, SensorSeries], horizon: timedelta
     ) -> List[Dict[str, Any]]:
         """Predict environmental events based on sensor correlations."""
 
@@ -1011,8 +1375,8 @@ async def _predict_environmental_events(
 
             if len(temp_readings) >= 5 and len(humidity_readings) >= 5:
                 # Predict comfort zone departure
-                recent_temp = temp_readings[-1].value
-                recent_humidity = humidity_readings[-1].value
+                recent_temp = temp_readings.values[-1]
+                recent_humidity = humidity_readings.values[-1]
 
                 # Simple comfort zone check (expanded logic could be more sophisticated)
                 if recent_temp > 75 and recent_humidity > 60:  # Hot and humid
@@ -1054,11 +1418,15 @@ async def _predict_resource_usage(
         memory_usage = []
 
         for event in system_events:
-            if event.event_data:
-                if "cpu_percent" in event.event_data:
-                    cpu_usage.append(event.event_data["cpu_percent"])
-                if "memory_percent" in event.event_data:
-                    memory_usage.append(event.event_data["memory_percent"])
+            event_data = event.event_data
+            if not event_data:
+                continue
+            cpu_percent = event_data.get("cpu_percent")
+            if cpu_percent is not None:
+                cpu_usage.append(cpu_percent)
+            memory_percent = event_data.get("memory_percent")
+            if memory_percent is not None:
+                memory_usage.append(memory_percent)
 
         if not cpu_usage and not memory_usage:
             return None
@@ -1072,13 +1440,15 @@ async def _predict_resource_usage(
         # Predict CPU usage
         if len(cpu_usage) >= 3:
             current_cpu = cpu_usage[-1]
-            avg_cpu = (
-                np.mean(cpu_usage[-5:]) if len(cpu_usage) >= 5 else np.mean(cpu_usage)
-            )
+            recent_cpu = cpu_usage[-5:]
+            avg_cpu = sum(recent_cpu) / len(recent_cpu)
 
             # Simple trend-based prediction
             if len(cpu_usage) >= 5:
-                recent_trend = np.mean(cpu_usage[-3:]) - np.mean(cpu_usage[-6:-3])
+                earlier_cpu = cpu_usage[-6:-3]
+                recent_trend = sum(cpu_usage[-3:]) / 3 - sum(earlier_cpu) / len(
+                    earlier_cpu
+                )
                 predicted_cpu = current_cpu + recent_trend
             else:
                 predicted_cpu = avg_cpu
@@ -1092,14 +1462,14 @@ async def _predict_resource_usage(
         # Predict memory usage
         if len(memory_usage) >= 3:
             current_memory = memory_usage[-1]
-            avg_memory = (
-                np.mean(memory_usage[-5:])
-                if len(memory_usage) >= 5
-                else np.mean(memory_usage)
-            )
+            recent_memory = memory_usage[-5:]
+            avg_memory = sum(recent_memory) / len(recent_memory)
 
             if len(memory_usage) >= 5:
-                recent_trend = np.mean(memory_usage[-3:]) - np.mean(memory_usage[-6:-3])
+                earlier_memory = memory_usage[-6:-3]
+                recent_trend = sum(memory_usage[-3:]) / 3 - sum(earlier_memory) / len(
+                    earlier_memory
+                )
                 predicted_memory = current_memory + recent_trend
             else:
                 predicted_memory = avg_memory
@@ -1117,13 +1487,12 @@ async def _predict_system_bottlenecks(
     ) -> Optional[Dict[str, Any]]:
         """Predict potential system bottlenecks."""
 
+        # Both recent counts share one cutoff
+        recent_cutoff = datetime.utcnow() - timedelta(hours=2)
+
         # Analyze control action frequency
-        recent_actions = len(
-            [
-                a
-                for a in control_actions
-                if a.executed_at >= datetime.utcnow() - timedelta(hours=2)
-            ]
+        recent_actions = sum(
+            1 for a in control_actions if a.executed_at >= recent_cutoff
         )
         total_actions = len(control_actions)
 
@@ -1133,13 +1502,10 @@ async def _predict_system_bottlenecks(
         action_rate = recent_actions / 2  # Actions per hour
 
         # Analyze error frequency
-        error_events = [e for e in system_events if e.severity in ["high", "critical"]]
-        recent_errors = len(
-            [
-                e
-                for e in error_events
-                if e.created_at >= datetime.utcnow() - timedelta(hours=2)
-            ]
+        recent_errors = sum(
+            1
+            for e in system_events
+            if e.severity in ("high", "critical") and e.created_at >= recent_cutoff
         )
 
         bottleneck_risk = 0.0
@@ -1246,13 +1612,10 @@ async def _predict_system_errors(
         return None
 
     async def _predict_device_health(
-        self, device: Device, recent_actions: List[ControlAction], horizon: timedelta
+        self, device: Device, device_actions: List[ControlAction], horizon: timedelta
     ) -> Optional[Dict[str, Any]]:
         """Predict device health trends."""
 
-        # Get actions for this device
-        device_actions = [a for a in recent_actions if a.device_id == device.id]
-
         if len(device_actions) < 3:
             return None
 
@@ -1281,20 +1644,19 @@ async def _predict_device_health(
         return None
 
     async def _predict_device_maintenance(
-        self, device: Device, recent_actions: List[ControlAction], horizon: timedelta
+        self,
+        device: Device,
+        device_actions: List[ControlAction],
+        window_hours: float,
+        horizon: timedelta,
     ) -> Optional[Dict[str, Any]]:
         """Predict device maintenance needs."""
 
-        device_actions = [a for a in recent_actions if a.device_id == device.id]
-
         if len(device_actions) < 5:
             return None
 
-        # Calculate usage intensity
-        time_span = (
-            recent_actions[-1].executed_at - recent_actions[0].executed_at
-        ).total_seconds() / 3600
-        usage_rate = len(device_actions) / time_span  # Actions per hour
+        # Calculate usage intensity over the whole recent-action window
+        usage_rate = len(device_actions) / window_hours  # Actions per hour
 
         # Predict maintenance need based on usage
         if usage_rate > 2:  # High usage device
@@ -1315,25 +1677,19 @@ async def _predict_device_maintenance(
         return None
 
     async def _predict_device_usage(
-        self, device: Device, recent_actions: List[ControlAction], horizon: timedelta
+        self, device: Device, device_actions: List[ControlAction], horizon: timedelta
     ) -> Optional[Dict[str, Any]]:
         """Predict device usage patterns."""
 
-        device_actions = [a for a in recent_actions if a.device_id == device.id]
-
         if len(device_actions) < 10:
             return None
 
         # Analyze hourly usage patterns
-        hourly_usage = {}
-        for action in device_actions:
-            hour = action.executed_at.hour
-            hourly_usage[hour] = hourly_usage.get(hour, 0) + 1
+        hourly_usage = Counter(action.executed_at.hour for action in device_actions)
 
         # Find peak usage hours
         if hourly_usage:
-            peak_hour = max(hourly_usage, key=hourly_usage.get)
-            peak_usage = hourly_usage[peak_hour]
+            peak_hour, peak_usage = hourly_usage.most_common(1)[0]
 
             return {
                 "type": "device_usage_prediction",
@@ -1341,44 +1697,43 @@ async def _predict_device_usage(
                 "device_name": device.user_name,
                 "peak_hour": peak_hour,
                 "peak_usage_count": peak_usage,
-                "usage_pattern": hourly_usage,
+                "usage_pattern": dict(hourly_usage),
                 "confidence": 0.6,
             }
 
         return None
 
     async def _predict_emotional_trends(
-        self, recent_states: List[EmotionalState], horizon: timedelta
+        self, emotion_matrix: np.ndarray, horizon: timedelta
     ) -> Optional[Dict[str, Any]]:
-        """Predict emotional state trends."""
+        """Predict emotional state trends from a states x emotions matrix."""
 
-        if len(recent_states) < 5:
+        if len(emotion_matrix) < 5:
             return None
 
+        # Least-squares slope of every emotion column against the state index
+        steps = np.arange(len(emotion_matrix), dtype=np.float64)
+        steps -= steps.mean()
+        slopes = steps @ emotion_matrix / np.dot(steps, steps)
+
         # Analyze trends in each emotion
-        emotions = ["happiness", "worry", "boredom", "excitement"]
         trends = {}
 
-        for emotion in emotions:
-            values = [getattr(state, emotion) for state in recent_states]
-
-            # Calculate trend slope
-            if len(values) >= 3:
-                x = list(range(len(values)))
-                slope = np.polyfit(x, values, 1)[0]
-
-                trends[emotion] = {
-                    "current_value": values[-1],
-                    "trend_direction": "increasing"
-                    if slope > 0.01
-                    else "decreasing"
-                    if slope < -0.01
-                    else "stable",
-                    "trend_strength": abs(slope),
-                    "predicted_value": max(
-                        0, min(1, values[-1] + slope * 3)
-                    ),  # Project 3 time steps ahead
-                }
+        for emotion, current_value, slope in zip(
+            _EMOTIONS, emotion_matrix[-1].tolist(), slopes.tolist()
+        ):
+            trends[emotion] = {
+                "current_value": current_value,
+                "trend_direction": "increasing"
+                if slope > 0.01
+                else "decreasing"
+                if slope < -0.01
+                else "stable",
+                "trend_strength": abs(slope),
+                "predicted_value": max(
+                    0, min(1, current_value + slope * 3)
+                ),  # Project 3 time steps ahead
+            }
 
         if trends:
             return {
@@ -1391,22 +1746,17 @@ async def _predict_emotional_trends(
         return None
 
     async def _predict_emotional_stability(
-        self, recent_states: List[EmotionalState], horizon: timedelta
+        self, emotion_matrix: np.ndarray, horizon: timedelta
     ) -> Optional[Dict[str, Any]]:
-        """Predict emotional stability."""
+        """Predict emotional stability from a states x emotions matrix."""
 
-        if len(recent_states) < 3:
+        if len(emotion_matrix) < 3:
             return None
 
-        # Calculate emotional volatility
-        emotions = ["happiness", "worry", "boredom", "excitement"]
-        volatilities = {}
-
-        for emotion in emotions:
-            values = [getattr(state, emotion) for state in recent_states]
-            volatilities[emotion] = np.std(values)
+        # Calculate emotional volatility of every emotion column at once
+        volatilities = dict(zip(_EMOTIONS, emotion_matrix.std(axis=0).tolist()))
 
-        avg_volatility = np.mean(list(volatilities.values()))
+        avg_volatility = sum(volatilities.values()) / len(volatilities)
 
         # Predict stability
         stability_score = max(0, 1 - avg_volatility * 2)
@@ -1437,51 +1787,55 @@ async def _predict_emotional_triggers(
             return None
 
         # Count trigger frequency
-        trigger_counts = {}
-        for trigger in trigger_events:
-            trigger_counts[trigger] = trigger_counts.get(trigger, 0) + 1
+        trigger_counts = Counter(trigger_events)
 
         # Find most common triggers
-        most_common_trigger = max(trigger_counts, key=trigger_counts.get)
-        trigger_frequency = trigger_counts[most_common_trigger] / len(trigger_events)
+        most_common_trigger, trigger_count = trigger_counts.most_common(1)[0]
+        trigger_frequency = trigger_count / len(trigger_events)
 
         if trigger_frequency > 0.3:  # Significant pattern
             return {
                 "type": "emotional_trigger_prediction",
                 "most_likely_trigger": most_common_trigger,
                 "trigger_probability": trigger_frequency,
-                "all_triggers": trigger_counts,
+                "all_triggers": dict(trigger_counts),
                 "confidence": min(0.8, trigger_frequency * 2),
             }
 
         return None
 
-    async def _calculate_temporal_probability(
-        self, historical_data: List[Event], horizon: timedelta, context: Dict[str, Any]
+    def _average_event_interval(self, historical_data: List[Event]) -> float:
+        """Return the mean number of seconds between consecutive events.
+
+        The events are ordered by time, so the consecutive gaps telescope
+        and their mean is the overall span divided by the number of gaps.
+        A zero span means the events were back to back, e.g. rows inserted
+        in one transaction sharing ``now()``; the mean is then floored at
+        one microsecond, the datetime resolution, so the estimators never
+        divide by zero.
+        """
+
+        span = historical_data[-1].created_at - historical_data[0].created_at
+
+        return max(
+            span.total_seconds() / (len(historical_data) - 1),
+            timedelta.resolution.total_seconds(),
+        )
+
+    def _calculate_temporal_probability(
+        self, historical_data: List[Event], avg_interval: float, now: datetime
     ) -> float:
         """Calculate probability based on temporal patterns."""
 
         if len(historical_data) < 3:
             return 0.1
 
-        # Analyze time intervals between events
-        intervals = []
-        for i in range(1, len(historical_data)):
-            interval = (
-                historical_data[i].created_at - historical_data[i - 1].created_at
-            ).total_seconds()
-            intervals.append(interval)
-
-        if not intervals:
-            return 0.1
-
-        # Calculate average interval
-        avg_interval = np.mean(intervals)
+        # Back-to-back events: any time since the last one is past the average
+        if avg_interval <= 0:
+            return 0.9
 
         # Calculate probability based on how much time has passed since last event
-        time_since_last = (
-            datetime.utcnow() - historical_data[-1].created_at
-        ).total_seconds()
+        time_since_last = (now - historical_data[-1].created_at).total_seconds()
 
         # Simple probability model: higher probability if we're past the average interval
         if time_since_last >= avg_interval:
@@ -1491,7 +1845,7 @@ async def _calculate_temporal_probability(
 
         return probability
 
-    async def _calculate_contextual_probability(
+    def _calculate_contextual_probability(
         self, historical_data: List[Event], context: Dict[str, Any]
     ) -> float:
         """Calculate probability based on contextual similarity."""
@@ -1525,8 +1879,8 @@ async def _calculate_contextual_probability(
 
         return min(0.9, context_matches / total_contexts)
 
-    async def _calculate_trend_probability(
-        self, historical_data: List[Event], horizon: timedelta
+    def _calculate_trend_probability(
+        self, historical_data: List[Event], now: datetime
     ) -> float:
         """Calculate probability based on trend analysis."""
 
@@ -1534,20 +1888,9 @@ async def _calculate_trend_probability(
             return 0.4
 
         # Analyze frequency trend
-        recent_events = len(
-            [
-                e
-                for e in historical_data
-                if e.created_at >= datetime.utcnow() - timedelta(days=7)
-            ]
-        )
-        older_events = len(
-            [
-                e
-                for e in historical_data
-                if e.created_at < datetime.utcnow() - timedelta(days=7)
-            ]
-        )
+        week_ago = now - timedelta(days=7)
+        recent_events = sum(1 for e in historical_data if e.created_at >= week_ago)
+        older_events = len(historical_data) - recent_events
 
         if older_events == 0:
             return 0.5
@@ -1563,35 +1906,29 @@ async def _calculate_trend_probability(
         # Higher trend factor = increasing frequency = higher probability
         return min(0.9, max(0.1, trend_factor * 0.5))
 
-    async def _predict_event_timing(
-        self, historical_data: List[Event], horizon: timedelta, context: Dict[str, Any]
+    def _predict_event_timing(
+        self,
+        historical_data: List[Event],
+        avg_interval: float,
+        horizon: timedelta,
+        now: datetime,
     ) -> Optional[datetime]:
         """Predict when an event is likely to occur."""
 
         if len(historical_data) < 2:
             return None
 
-        # Calculate average interval
-        intervals = []
-        for i in range(1, len(historical_data)):
-            interval = (
-                historical_data[i].created_at - historical_data[i - 1].created_at
-            ).total_seconds()
-            intervals.append(interval)
-
-        avg_interval = np.mean(intervals)
-
         # Predict next occurrence
         last_event_time = historical_data[-1].created_at
         predicted_time = last_event_time + timedelta(seconds=avg_interval)
 
         # Check if within horizon
-        if predicted_time <= datetime.utcnow() + horizon:
+        if predicted_time <= now + horizon:
             return predicted_time
 
         return None
 
-    async def _calculate_event_prediction_confidence(
+    def _calculate_event_prediction_confidence(
         self,
         prediction: Dict[str, Any],
         historical_data: List[Event],
@@ -1607,17 +1944,17 @@ async def _calculate_event_prediction_confidence(
 
         # Consistency factor (how similar the probability estimates are)
         if len(probability_estimates) > 1:
-            consistency = 1.0 - np.std(probability_estimates)
+            consistency = 1.0 - _population_std(probability_estimates)
             confidence_factors.append(max(0.0, consistency))
 
         # Probability magnitude factor
-        avg_probability = np.mean(probability_estimates)
+        avg_probability = sum(probability_estimates) / len(probability_estimates)
         magnitude_factor = min(1.0, avg_probability * 2)
         confidence_factors.append(magnitude_factor)
 
-        return np.mean(confidence_factors)
+        return sum(confidence_factors) / len(confidence_factors)
 
-    async def _identify_influencing_factors(
+    def _identify_influencing_factors(
         self, event_type: str, historical_data: List[Event], context: Dict[str, Any]
     ) -> List[Dict[str, str]]:
         """Identify factors that influence event occurrence."""
@@ -1625,9 +1962,10 @@ async def _identify_influencing_factors(
         factors = []
 
         # Temporal factors
-        hours = [event.created_at.hour for event in historical_data]
-        if hours:
-            most_common_hour = max(set(hours), key=hours.count)
+        hour_counts = Counter(event.created_at.hour for event in historical_data)
+        if hour_counts:
+            # Ties go to the earliest hour
+            most_common_hour = max(sorted(hour_counts), key=hour_counts.__getitem__)
             factors.append(
                 {
                     "type": "temporal",
@@ -1659,7 +1997,7 @@ async def _identify_influencing_factors(
 
         return factors
 
-    async def _assess_event_risk_level(
+    def _assess_event_risk_level(
         self, prediction: Dict[str, Any], event_type: str
     ) -> str:
         """Assess risk level of predicted event."""
@@ -1676,9 +2014,7 @@ async def _assess_event_risk_level(
         else:
             return "low"
 
-    async def _generate_event_recommendations(
-        self, prediction: Dict[str, Any]
-    ) -> List[str]:
+    def _generate_event_recommendations(self, prediction: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on event prediction."""
 
         recommendations = []
@@ -1697,28 +2033,15 @@ async def _generate_event_recommendations(
 
         return recommendations
 
-    async def _calculate_interaction_strength(
+    def _calculate_interaction_strength(
         self, pred1: Dict[str, Any], pred2: Dict[str, Any]
     ) -> float:
         """Calculate strength of interaction between two predictions."""
 
         # Simple interaction model based on prediction types
-        type1 = pred1["prediction_type"]
-        type2 = pred2["prediction_type"]
-
-        # Define interaction strengths between different prediction types
-        interaction_matrix = {
-            ("user_behavior", "emotional_state"): 0.8,
-            ("environmental", "system_performance"): 0.6,
-            ("device_status", "system_performance"): 0.7,
-            ("user_behavior", "device_status"): 0.5,
-            ("environmental", "emotional_state"): 0.4,
-        }
-
-        # Check both directions
-        strength = interaction_matrix.get((type1, type2), 0.0)
-        if strength == 0.0:
-            strength = interaction_matrix.get((type2, type1), 0.0)
+        strength = _INTERACTION_STRENGTHS.get(
+            (pred1["prediction_type"], pred2["prediction_type"]), 0.0
+        )
 
         # Add confidence factor
         avg_confidence = (pred1["confidence"] + pred2["confidence"]) / 2
@@ -1791,7 +2114,7 @@ async def _generate_compound_description(
     async def _assess_compound_risk(self, predictions: List[Dict[str, Any]]) -> str:
         """Assess risk level of compound scenario."""
 
-        avg_confidence = np.mean([p["confidence"] for p in predictions])
+        avg_confidence = sum(p["confidence"] for p in predictions) / len(predictions)
         complexity_factor = len(predictions) * 0.1
 
         total_risk = avg_confidence + complexity_factor
@@ -1825,12 +2148,12 @@ async def _generate_compound_recommendations(
 
         return recommendations
 
-    async def _store_prediction_memory(self, prediction: Dict[str, Any]):
-        """Store prediction as memory for future learning."""
+    def _queue_prediction_memory(self, prediction: Dict[str, Any]):
+        """Queue prediction as memory for future learning."""
 
         importance = 0.4 + (prediction["confidence"] * 0.4)
 
-        await self.memory_repo.create(
+        memory = Memory(
             memory_type="semantic",
             category="predictions",
             importance=importance,
@@ -1842,6 +2165,17 @@ async def _store_prediction_memory(self, prediction: Dict[str, Any]):
             tags=["prediction", prediction["prediction_type"]],
             related_entities=[prediction["prediction_type"]],
         )
+        self._pending_memories.append(memory)
+
+    async def _flush_prediction_memories(self):
+        """Insert all queued prediction memories with a single commit."""
+
+        if not self._pending_memories:
+            return
+
+        memories, self._pending_memories = self._pending_memories, []
+        self.session.add_all(memories)
+        await self.session.commit()
 
     async def _update_accuracy_metrics(self):
         """Update prediction accuracy metrics."""
@@ -1,5 +1,7 @@
+import json
 import os
-from typing import AsyncGenerator
+from functools import partial
+from typing import Any, AsyncGenerator
 
 from sqlalchemy import create_engine
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
@@ -8,6 +10,21 @@
 from .config import settings
 from .models.base import Base
 
+# Use orjson for JSON columns when available, compact stdlib json otherwise
+try:
+    import orjson
+
+    def json_serializer(obj: Any) -> str:
+        """Serialize a JSON column value with orjson."""
+        return orjson.dumps(
+            obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+    json_deserializer = orjson.loads
+except ImportError:
+    json_serializer = partial(json.dumps, separators=(",", ":"))
+    json_deserializer = json.loads
+
 # Async engine for main application
 async_engine = create_async_engine(
     settings.DATABASE_URL,
@@ -16,6 +33,8 @@
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_recycle=3600,
     pool_pre_ping=True,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
 )
 
 # Session factory
@@ -23,10 +42,18 @@
     async_engine, expire_on_commit=False, class_=AsyncSession
 )
 
+# Session factory for read-only analytics queries that run concurrently,
+# each on its own pooled connection
+AnalyticsSessionLocal = async_sessionmaker(
+    async_engine, expire_on_commit=False, autoflush=False, class_=AsyncSession
+)
+
 # Sync engine for migrations
 sync_engine = create_engine(
     settings.DATABASE_URL.replace("sqlite+aiosqlite://", "sqlite:///"),
     echo=settings.DATABASE_ECHO,
+    json_serializer=json_serializer,
+    json_deserializer=json_deserializer,
 )
 
 SyncSessionLocal = sessionmaker(bind=sync_engine)
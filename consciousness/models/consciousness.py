@@ -63,6 +63,12 @@ class EmotionalState(BaseModel):
     )
 
 
+def _content_event_type(context) -> Optional[str]:
+    """Default a memory's event type to the one recorded in its content."""
+    content = context.get_current_parameters().get("content")
+    return content.get("event_type") if isinstance(content, dict) else None
+
+
 class Memory(BaseModel):
     """Stores consciousness memories and experiences."""
 
@@ -81,6 +87,9 @@ class Memory(BaseModel):
     title: Mapped[str] = mapped_column(String(255))
     description: Mapped[str] = mapped_column(Text)
     content: Mapped[Dict[str, Any]] = mapped_column(JSON)
+    event_type: Mapped[Optional[str]] = mapped_column(
+        String(100), default=_content_event_type
+    )  # copied from content for indexed lookups
 
     # Memory metadata
     source: Mapped[str] = mapped_column(
@@ -106,6 +115,7 @@ class Memory(BaseModel):
         Index("ix_memories_importance", "importance"),
         Index("ix_memories_created_at", "created_at"),
         Index("ix_memories_last_accessed", "last_accessed"),
+        Index("ix_memories_event_type_created_at", "event_type", "created_at"),
     )
 
 
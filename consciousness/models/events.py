@@ -72,8 +72,9 @@ class Event(BaseModel):
 
     __table_args__ = (
         Index("ix_events_type_category", "event_type", "category"),
+        Index("ix_events_type_created_at", "event_type", "created_at"),
         Index("ix_events_severity", "severity"),
-        Index("ix_events_created_at", "created_at"),
+        Index("ix_events_created_at_id", "created_at", "id"),
         Index("ix_events_processed", "processed"),
     )
 
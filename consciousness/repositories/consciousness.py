@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, asc, desc, func, or_, select, update
+from sqlalchemy import ColumnElement, and_, asc, desc, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..models.consciousness import EmotionalState, Experience, Memory
@@ -65,15 +65,14 @@ class MemoryRepository(BaseRepository[Memory]):
     def __init__(self, session: AsyncSession):
         super().__init__(Memory, session)
 
-    async def search_memories(
+    def _search_filters(
         self,
         query: str,
-        memory_type: Optional[str] = None,
-        category: Optional[str] = None,
-        min_importance: float = 0.0,
-        limit: int = 10,
-    ) -> List[Memory]:
-        """Search memories by content and filters."""
+        memory_type: Optional[str],
+        category: Optional[str],
+        min_importance: float,
+    ) -> List[Any]:
+        """Build the filters shared by the memory search queries."""
         filters = [Memory.importance >= min_importance]
 
         if memory_type:
@@ -85,6 +84,18 @@ async def search_memories(
         filters.append(
             or_(Memory.title.contains(query), Memory.description.contains(query))
         )
+        return filters
+
+    async def search_memories(
+        self,
+        query: str,
+        memory_type: Optional[str] = None,
+        category: Optional[str] = None,
+        min_importance: float = 0.0,
+        limit: int = 10,
+    ) -> List[Memory]:
+        """Search memories by content and filters."""
+        filters = self._search_filters(query, memory_type, category, min_importance)
 
         result = await self.session.execute(
             select(Memory)
@@ -94,6 +105,28 @@ async def search_memories(
         )
         return result.scalars().all()
 
+    async def search_memories_ranked(
+        self,
+        query: str,
+        relevance: ColumnElement[float],
+        memory_type: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Tuple[Memory, float]]:
+        """Search memories ranked by relevance weighted by importance."""
+        filters = self._search_filters(query, memory_type, None, 0.0)
+
+        result = await self.session.execute(
+            select(Memory, relevance)
+            .where(and_(*filters))
+            .order_by(
+                desc(relevance * Memory.importance),
+                desc(Memory.importance),
+                desc(Memory.created_at),
+            )
+            .limit(limit)
+        )
+        return result.all()
+
     async def get_related_memories(self, entity: str, limit: int = 5) -> List[Memory]:
         """Get memories related to a specific entity."""
         # For SQLite, we use JSON_EXTRACT function to search in JSON arrays
@@ -120,6 +153,19 @@ async def update_access(self, memory_id: int):
         )
         await self.session.commit()
 
+    async def update_access_many(self, memory_ids: List[int]):
+        """Update access tracking for several memories in one statement."""
+        if not memory_ids:
+            return
+        await self.session.execute(
+            update(Memory)
+            .where(Memory.id.in_(memory_ids))
+            .values(
+                access_count=Memory.access_count + 1, last_accessed=datetime.utcnow()
+            )
+        )
+        await self.session.commit()
+
 
 class InterviewRepository(BaseRepository[InterviewSession]):
     """Repository for interview session management."""
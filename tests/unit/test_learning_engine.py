@@ -0,0 +1,358 @@
+"""
+Test suite for the learning engine.
+Tests learning cycle orchestration and pattern analysis helpers.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from consciousness.core.learning_engine import ExperienceBatch, LearningEngine
+
+
+@pytest.mark.asyncio
+async def test_learning_cycle_fetches_corpus_once():
+    """Test each learner receives its slice of a single corpus fetch."""
+    mock_session = AsyncMock()
+    engine = LearningEngine(mock_session)
+
+    corpus = {
+        "positive_experiences": ["positive"],
+        "outcome_stats": ["stats"],
+        "control_actions": ["action"],
+        "user_interactions": ["interaction"],
+        "error_events": ["error"],
+    }
+    engine._fetch_learning_corpus = AsyncMock(return_value=corpus)
+    engine._learn_patterns = MagicMock(return_value=1)
+    engine._adapt_behaviors = MagicMock(return_value=0)
+    engine._optimize_efficiency = MagicMock(return_value=2)
+    engine._learn_user_preferences = MagicMock(return_value=0)
+    engine._learn_from_errors = AsyncMock(return_value=1)
+    engine._queue_metrics_update = MagicMock()
+    engine._store_learning_insights = MagicMock()
+
+    updates = await engine.process_learning_updates()
+
+    assert updates == 4
+    engine._fetch_learning_corpus.assert_awaited_once()
+    engine._learn_patterns.assert_called_once_with(["positive"])
+    engine._adapt_behaviors.assert_called_once_with(["stats"])
+    engine._optimize_efficiency.assert_called_once_with(["action"])
+    engine._learn_user_preferences.assert_called_once_with(["interaction"])
+    engine._learn_from_errors.assert_awaited_once_with(["error"])
+    metrics = engine.performance_metrics
+    engine._store_learning_insights.assert_called_once_with(4, metrics)
+    engine._queue_metrics_update.assert_called_once_with(metrics)
+    mock_session.commit.assert_awaited_once()
+
+
+def test_analyze_experience_pattern_common_context_and_peak_hour():
+    """Test context modes and peak hour are found in a single pass."""
+    mock_session = AsyncMock()
+    engine = LearningEngine(mock_session)
+
+    experiences = [
+        SimpleNamespace(
+            experience_type="device_action",
+            outcome="positive" if i < 3 else "negative",
+            impact_score=0.5,
+            context={"device_type": "light" if i < 3 else "fan", "room": ""},
+            created_at=datetime(2024, 1, 1, 8 if i < 3 else 20),
+        )
+        for i in range(4)
+    ]
+
+    pattern = engine._analyze_experience_pattern(
+        ExperienceBatch.from_experiences(experiences)
+    )
+
+    assert pattern["sample_size"] == 4
+    assert pattern["success_rate"] == pytest.approx(0.75)
+    assert pattern["average_impact"] == pytest.approx(0.5)
+    assert pattern["common_contexts"] == {
+        "device_type": {"value": "light", "frequency": 0.75}
+    }
+    assert pattern["temporal_patterns"]["peak_hour"] == {
+        "hour": 8,
+        "frequency": 0.75,
+    }
+
+
+def test_analyze_action_efficiency_execution_statistics():
+    """Test execution time statistics skip actions without timestamps."""
+    mock_session = AsyncMock()
+    engine = LearningEngine(mock_session)
+
+    created = datetime(2024, 1, 1, 12, 0, 0)
+    actions = [
+        SimpleNamespace(
+            status="completed",
+            created_at=created,
+            executed_at=created + timedelta(seconds=2),
+        ),
+        SimpleNamespace(
+            status="completed",
+            created_at=created,
+            executed_at=created + timedelta(seconds=6),
+        ),
+        SimpleNamespace(status="failed", created_at=created, executed_at=None),
+    ]
+
+    analysis = engine._analyze_action_efficiency(actions)
+
+    assert analysis["total_actions"] == 3
+    assert analysis["successful_actions"] == 2
+    assert analysis["average_execution_time"] == pytest.approx(4.0)
+    assert analysis["execution_time_variance"] == pytest.approx(4.0)
+    assert analysis["efficiency_score"] == pytest.approx((2 / 3 + 1 / 1.8) / 2)
+
+
+def test_analyze_outcome_patterns_pivots_aggregated_rows():
+    """Test aggregated outcome rows become per-context analyses."""
+    mock_session = AsyncMock()
+    engine = LearningEngine(mock_session)
+
+    outcome_stats = [
+        SimpleNamespace(
+            behavior_context="lighting",
+            total_outcomes=4,
+            positive_outcomes=1,
+            average_impact=-0.25,
+        ),
+        SimpleNamespace(
+            behavior_context="device_action",
+            total_outcomes=2,
+            positive_outcomes=2,
+            average_impact=0.4,
+        ),
+    ]
+
+    analysis = engine._analyze_outcome_patterns(outcome_stats)
+
+    assert set(analysis) == {"lighting", "device_action"}
+    assert analysis["lighting"]["negative_outcomes"] == 3
+    assert analysis["lighting"]["success_rate"] == pytest.approx(0.25)
+    assert analysis["lighting"]["sample_size"] == 4
+    assert analysis["device_action"]["average_impact"] == pytest.approx(0.4)
+
+
+@pytest.mark.asyncio
+async def test_learning_memories_are_inserted_in_one_batch():
+    """Test queued learning memories are added together with a single flush."""
+    mock_session = AsyncMock()
+    mock_session.add_all = MagicMock()
+    engine = LearningEngine(mock_session)
+
+    pattern = {"confidence": 0.8, "sample_size": 5}
+    engine._store_pattern_memory("device_action_positive", pattern, [])
+    engine._store_preference_memory("timing_preference", pattern)
+
+    mock_session.add_all.assert_not_called()
+    assert len(engine._pending_memories) == 2
+
+    await engine._flush_pending_memories()
+
+    (memories,), _ = mock_session.add_all.call_args
+    assert [m.category for m in memories] == ["pattern_learning", "user_preferences"]
+    mock_session.flush.assert_awaited_once()
+    assert engine._pending_memories == []
+
+
+@pytest.mark.asyncio
+async def test_idle_tables_skip_corpus_queries():
+    """Test empty windows skip their corpus queries and reuse the probe."""
+    mock_session = AsyncMock()
+    probe = MagicMock()
+    probe.one.return_value._mapping = {
+        "experiences": 0,
+        "events": 0,
+        "control_actions": 0,
+    }
+    mock_session.execute = AsyncMock(return_value=probe)
+    engine = LearningEngine(mock_session)
+
+    corpus = await engine._fetch_learning_corpus()
+    await engine._fetch_learning_corpus()
+
+    assert mock_session.execute.await_count == 1
+    assert len(corpus["positive_experiences"]) == 0
+    assert corpus["outcome_stats"] == []
+    assert corpus["control_actions"] == []
+
+
+@pytest.mark.asyncio
+async def test_corpus_queries_use_own_sessions_with_sessionmaker():
+    """Test corpus queries run on sessionmaker sessions, not the shared one."""
+    mock_session = AsyncMock()
+    probe = MagicMock()
+    probe.one.return_value._mapping = {
+        "experiences": 1,
+        "events": 0,
+        "control_actions": 1,
+    }
+    mock_session.execute = AsyncMock(return_value=probe)
+
+    read_session = AsyncMock()
+    read_session.execute = AsyncMock(return_value=MagicMock())
+    sessionmaker = MagicMock()
+    sessionmaker.return_value.__aenter__.return_value = read_session
+
+    engine = LearningEngine(mock_session, sessionmaker)
+    corpus = await engine._fetch_learning_corpus()
+
+    assert mock_session.execute.await_count == 1
+    assert sessionmaker.call_count == 3
+    assert read_session.execute.await_count == 3
+    assert corpus["user_interactions"] == []
+
+
+@pytest.mark.asyncio
+async def test_learning_cycle_shares_one_timestamp():
+    """Test memories queued in one cycle carry the cycle's timestamp."""
+    mock_session = AsyncMock()
+    mock_session.add_all = MagicMock()
+    engine = LearningEngine(mock_session)
+
+    seen_now = []
+
+    async def fetch_corpus():
+        seen_now.append(engine._now())
+        return {
+            "positive_experiences": [],
+            "outcome_stats": [],
+            "control_actions": [],
+            "user_interactions": [],
+            "error_events": [],
+        }
+
+    def learn(interactions):
+        seen_now.append(engine._cycle_now)
+        engine._store_preference_memory(
+            "timing_preference", {"confidence": 0.95, "sample_size": 5}
+        )
+        return 1
+
+    engine._fetch_learning_corpus = fetch_corpus
+    engine._learn_patterns = MagicMock(return_value=0)
+    engine._adapt_behaviors = MagicMock(return_value=0)
+    engine._optimize_efficiency = MagicMock(return_value=0)
+    engine._learn_user_preferences = MagicMock(side_effect=learn)
+    engine._learn_from_errors = AsyncMock(return_value=0)
+    engine._queue_metrics_update = MagicMock()
+    engine._store_learning_insights = MagicMock()
+
+    await engine.process_learning_updates()
+
+    # The corpus fetch and the learner saw the same cycle timestamp
+    cycle_now, learner_now = seen_now
+    assert isinstance(cycle_now, datetime)
+    assert learner_now is cycle_now
+    engine._learn_user_preferences.assert_called_once_with([])
+    (memories,), _ = mock_session.add_all.call_args
+    assert memories[0].content["learning_date"] == cycle_now.isoformat()
+    assert engine._cycle_now is None
+    assert engine._cycle_now_iso is None
+
+
+@pytest.mark.asyncio
+async def test_batch_opportunity_scores_match_single_predictions():
+    """Test batched opportunity scoring agrees with one-at-a-time prediction."""
+    mock_session = AsyncMock()
+    engine = LearningEngine(mock_session)
+
+    contexts = [
+        {"a": 1, "b": [1], "c": {}, "d": 2, "confidence": 0.2, "priority": "high"},
+        {"priority": "low"},
+        {},
+    ]
+
+    batch = await engine.predict_learning_opportunities(contexts)
+    singles = [await engine.predict_learning_opportunity(c) for c in contexts]
+
+    assert [p["learning_type"] for p in batch] == [p["learning_type"] for p in singles]
+    assert [p["opportunity_score"] for p in batch] == pytest.approx(
+        [p["opportunity_score"] for p in singles]
+    )
+    assert await engine.predict_learning_opportunities([]) == []
+
+
+@pytest.mark.asyncio
+async def test_error_context_reads_overlap_with_sessionmaker():
+    """Test each error's related-event query runs on its own read session."""
+    mock_session = AsyncMock()
+    read_session = AsyncMock()
+    read_result = MagicMock()
+    read_result.all.return_value = []
+    read_session.execute = AsyncMock(return_value=read_result)
+    sessionmaker = MagicMock()
+    sessionmaker.return_value.__aenter__.return_value = read_session
+    engine = LearningEngine(mock_session, sessionmaker)
+
+    error_events = [
+        SimpleNamespace(
+            id=i,
+            event_type="network_error",
+            severity="critical",
+            event_data={"device_id": i},
+            created_at=datetime(2024, 1, 1, 12, i),
+        )
+        for i in range(3)
+    ]
+
+    updates = await engine._learn_from_errors(error_events)
+
+    assert updates == 3
+    assert read_session.execute.await_count == 3
+    mock_session.execute.assert_not_awaited()
+    assert len(engine._pending_memories) == 3
+
+
+@pytest.mark.asyncio
+async def test_background_writer_batches_learning_memories():
+    """Test a running memory writer inserts flushed memories on its own session."""
+    mock_session = AsyncMock()
+    mock_session.add_all = MagicMock()
+    write_session = AsyncMock()
+    write_session.add_all = MagicMock()
+    sessionmaker = MagicMock()
+    sessionmaker.return_value.__aenter__.return_value = write_session
+    engine = LearningEngine(mock_session)
+    engine.memory_flush_interval = 0.01
+
+    await engine.start_memory_writer(sessionmaker)
+    pattern = {"confidence": 0.8, "sample_size": 5}
+    engine._store_pattern_memory("device_action_positive", pattern, [])
+    engine._store_preference_memory("timing_preference", pattern)
+    await engine._flush_pending_memories()
+    await engine.stop_memory_writer()
+
+    mock_session.add_all.assert_not_called()
+    (memories,), _ = write_session.add_all.call_args
+    assert [m.category for m in memories] == ["pattern_learning", "user_preferences"]
+    write_session.commit.assert_awaited_once()
+    assert engine._memory_writer_task is None
+
+
+@pytest.mark.asyncio
+async def test_learning_memory_leaves_cycle_queue_pending():
+    """Test a single learning memory commits alone, not the cycle's queue."""
+    mock_session = AsyncMock()
+    mock_session.add = MagicMock()
+    mock_session.add_all = MagicMock()
+    engine = LearningEngine(mock_session)
+    pattern = {"confidence": 0.8, "sample_size": 5}
+    engine._store_pattern_memory("device_action_positive", pattern, [])
+
+    await engine._create_learning_memory(
+        {"event_type": "device_action"},
+        "positive",
+        {"patterns_discovered": [], "behaviors_adapted": [], "insights_gained": []},
+    )
+
+    (memory,), _ = mock_session.add.call_args
+    assert memory.category == "learning_experience"
+    mock_session.add_all.assert_not_called()
+    mock_session.commit.assert_awaited_once()
+    assert [m.category for m in engine._pending_memories] == ["pattern_learning"]
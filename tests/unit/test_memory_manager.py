@@ -0,0 +1,294 @@
+"""
+Test suite for the memory manager.
+Tests memory grouping, similarity and decay helpers.
+"""
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from consciousness.core.memory_manager import MemoryManager
+from consciousness.models.consciousness import Memory
+
+
+def _memory(memory_id, category, tags, entities=(), description=""):
+    return SimpleNamespace(
+        id=memory_id,
+        category=category,
+        memory_type="episodic",
+        tags=list(tags),
+        related_entities=list(entities),
+        description=description,
+    )
+
+
+def test_similarity_matrix_matches_pairwise_similarity():
+    """Test the batched matrix agrees with the single-pair calculation."""
+    manager = MemoryManager(AsyncMock())
+    memories = [
+        _memory(1, "device", ["light", "kitchen"], ["lamp"], "Turned light on"),
+        _memory(2, "device", ["light"], ["lamp"], "turned light off"),
+        _memory(3, "sensor", [], ["thermostat"], ""),
+        _memory(4, "device", ["kitchen", "door"], [], "door opened"),
+    ]
+
+    matrix = manager._similarity_matrix(memories)
+
+    for i, memory1 in enumerate(memories):
+        for j, memory2 in enumerate(memories):
+            if i != j:
+                assert matrix[i, j] == manager._calculate_memory_similarity(
+                    memory1, memory2
+                )
+
+
+def test_group_related_memories_groups_connected_components():
+    """Test similarity links memories transitively into ordered groups."""
+    manager = MemoryManager(AsyncMock())
+    memories = [
+        _memory(1, "device", ["light"], ["lamp"]),
+        _memory(2, "sensor", ["motion"], ["hall"]),
+        _memory(3, "device", ["light"], ["lamp", "desk"]),
+        _memory(4, "sensor", ["motion"], ["hall"]),
+        _memory(5, "general", ["misc"]),
+        _memory(6, "device", ["light"], ["desk"]),
+    ]
+
+    groups = manager._group_related_memories(memories)
+
+    # 1 and 6 are only linked through 3
+    assert manager._calculate_memory_similarity(memories[0], memories[5]) < 0.75
+    assert [[m.id for m in group] for group in groups] == [[1, 3, 6], [2, 4], [5]]
+    assert manager._group_related_memories([]) == []
+
+
+@pytest.mark.asyncio
+async def test_apply_memory_decay_writes_one_batched_update():
+    """Test streamed batches of decayed importances are written at once."""
+    mock_session = AsyncMock()
+    manager = MemoryManager(mock_session)
+    manager.memory_repo.update = AsyncMock()
+
+    created = datetime.utcnow() - timedelta(days=10)
+    batches = [[(1, "episodic", 0.8, created)], [(2, "semantic", 0.051, created)]]
+
+    async def partitions():
+        for batch in batches:
+            yield batch
+
+    stream = MagicMock()
+    stream.partitions.return_value = partitions()
+    mock_session.stream.return_value = stream
+
+    await manager._apply_memory_decay()
+
+    manager.memory_repo.update.assert_not_awaited()
+    mock_session.execute.assert_awaited_once()
+    rows = mock_session.execute.await_args.args[1]
+    assert [row["id"] for row in rows] == [1, 2]
+    assert rows[0]["importance"] == pytest.approx(0.8 * (1 - 0.02 - 0.1))
+    assert rows[1]["importance"] == 0.05
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_retrieve_memories_updates_access_in_one_call():
+    """Test access tracking is written once for the whole result set."""
+    manager = MemoryManager(AsyncMock())
+    now = datetime.utcnow()
+    memories = [
+        SimpleNamespace(
+            id=memory_id,
+            importance=importance,
+            access_count=0,
+            tags=["light"],
+            related_entities=[],
+            created_at=now,
+        )
+        for memory_id, importance in [(1, 0.2), (2, 0.9)]
+    ]
+    ranked = [(memories[1], 0.9), (memories[0], 0.6)]
+    manager.memory_repo.search_memories_ranked = AsyncMock(return_value=ranked)
+    manager.memory_repo.update_access = AsyncMock()
+    manager.memory_repo.update_access_many = AsyncMock()
+
+    results = await manager.retrieve_memories("light", {"light": True})
+
+    manager.memory_repo.update_access_many.assert_awaited_once_with([2, 1])
+    manager.memory_repo.update_access.assert_not_awaited()
+    assert [entry.memory.id for entry in results] == [2, 1]
+    assert [entry.relevance_score for entry in results] == [0.9, 0.6]
+    assert [entry.access_count for entry in results] == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_calculate_importance_counts_similar_memories_in_one_query():
+    """Test novelty and frequency share a single count query."""
+    mock_session = AsyncMock()
+    manager = MemoryManager(mock_session)
+    counts = MagicMock()
+    counts.one.return_value = (2, 0)
+    mock_session.execute.return_value = counts
+
+    importance = await manager._calculate_importance(
+        {"event_type": "device_action"}, None, "device_management"
+    )
+
+    mock_session.execute.assert_awaited_once()
+    assert manager._calculate_novelty(2) == pytest.approx(0.8)
+    assert manager._calculate_frequency_impact(0) == 0.9
+    assert importance == pytest.approx(
+        0.5 * 0.3 + 0.8 * 0.25 + 0.5 * 0.2 + 0.9 * 0.15 + 1.0 * 0.1
+    )
+
+
+def test_extract_tags_dedupes_in_order_with_time_tags():
+    """Test tags keep first-seen order and name the given time."""
+    manager = MemoryManager(AsyncMock())
+    now = datetime(2024, 3, 9, 14, 30)
+
+    tags = manager._extract_tags(
+        {"event_type": "general", "outcome": "positive"}, "general", now
+    )
+
+    assert tags == [
+        "general",
+        "outcome_positive",
+        "hour_14",
+        "day_saturday",
+        "month_march",
+    ]
+    assert manager._generate_memory_title({"event_type": "user_query"}, now) == (
+        "User Query - 2024-03-09 14:30"
+    )
+
+
+@pytest.mark.asyncio
+async def test_consolidation_writes_groups_and_singles_in_bulk():
+    """Test grouped and single memories are each updated with one statement."""
+    mock_session = AsyncMock()
+    manager = MemoryManager(mock_session)
+    manager.memory_repo.update = AsyncMock()
+    groups = [
+        [SimpleNamespace(id=1), SimpleNamespace(id=2)],
+        [SimpleNamespace(id=3)],
+        [SimpleNamespace(id=4)],
+    ]
+    manager._get_unconsolidated_memories = AsyncMock(return_value=["recent"])
+    manager._group_related_memories = MagicMock(return_value=groups)
+    manager._consolidate_memory_group = AsyncMock(return_value="consolidated")
+    manager._apply_memory_decay = AsyncMock()
+
+    consolidated = await manager.consolidate_recent_memories()
+
+    assert consolidated == 1
+    manager._consolidate_memory_group.assert_awaited_once_with(groups[0])
+    mock_session.execute.assert_awaited_once()
+    mock_session.commit.assert_awaited_once()
+    manager.memory_repo.update.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_form_memories_from_experiences_commits_once():
+    """Test a batch of memories and experience records shares one commit."""
+    mock_session = MagicMock()
+    mock_session.flush = AsyncMock()
+    mock_session.commit = AsyncMock()
+    mock_session.refresh = AsyncMock()
+    manager = MemoryManager(mock_session)
+    manager._calculate_importance = AsyncMock(return_value=0.6)
+    emotional_state = SimpleNamespace(id=7, intensity=0.8)
+
+    memories = await manager.form_memories_from_experiences(
+        [
+            {"event_type": "device_action", "outcome": "positive"},
+            {"event_type": "user_query", "outcome": "negative"},
+        ],
+        emotional_state,
+    )
+
+    assert [memory.memory_type for memory in memories] == ["semantic", "episodic"]
+    assert mock_session.flush.await_count == 2
+    mock_session.commit.assert_awaited_once()
+    added = [call.args[0] for call in mock_session.add.call_args_list]
+    experiences = [item for item in added if item not in memories]
+    assert [experience.impact_score for experience in experiences] == [0.4, -0.4]
+
+
+@pytest.mark.asyncio
+async def test_retrieve_memories_reuses_recent_rankings():
+    """Test repeated retrievals skip the search until memories change."""
+    manager = MemoryManager(AsyncMock())
+    memory = SimpleNamespace(id=1, importance=0.5, access_count=2)
+    manager.memory_repo.search_memories_ranked = AsyncMock(return_value=[(memory, 0.7)])
+    manager.memory_repo.update_access_many = AsyncMock()
+    manager.memory_repo.update = AsyncMock()
+
+    await manager.retrieve_memories("light", {"room": 1, "entities": ["lamp"]})
+    results = await manager.retrieve_memories(
+        "light", {"entities": ["lamp"], "room": 2}
+    )
+
+    manager.memory_repo.search_memories_ranked.assert_awaited_once()
+    assert manager.memory_repo.update_access_many.await_count == 2
+    assert results[0].relevance_score == 0.7
+
+    await manager.retrieve_memories("light", {"room": 1})
+    assert manager.memory_repo.search_memories_ranked.await_count == 2
+
+    await manager.update_memory_importance(1, 0.9)
+    await manager.retrieve_memories("light", {"room": 1})
+    assert manager.memory_repo.search_memories_ranked.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_retrieve_memories_ranks_in_sql_with_exact_matching():
+    """Test the SQL ranking orders, matches tags and entities exactly, and limits."""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Memory.__table__.create)
+
+    now = datetime.utcnow()
+    rows = [
+        ("exact", "lamp on", ["light"], ["5"], 0.9),
+        ("near miss", "lamp off", ["lights"], ["15"], 0.9),
+        ("exact, less important", "lamp dimmed", ["light"], ["5"], 0.5),
+        ("off topic", "door opened", ["light"], ["5"], 1.0),
+    ]
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add_all(
+            Memory(
+                memory_type="episodic",
+                category="device",
+                importance=importance,
+                title=title,
+                description=description,
+                content={},
+                source="internal",
+                confidence=0.8,
+                tags=tags,
+                related_entities=entities,
+                created_at=now,
+            )
+            for title, description, tags, entities, importance in rows
+        )
+        await session.commit()
+
+        manager = MemoryManager(session)
+        context = {"light": True, "entities": ["5"]}
+        results = await manager.retrieve_memories("lamp", context, limit=2)
+        everything = await manager.retrieve_memories("lamp", context, limit=10)
+
+    await engine.dispose()
+
+    # Half the context keys and every entity match, plus a full recency bonus
+    assert [entry.memory.title for entry in results] == ["exact", "near miss"]
+    assert results[0].relevance_score == pytest.approx(0.5 + 0.15 + 0.2 + 0.1, abs=1e-3)
+    assert results[1].relevance_score == pytest.approx(0.5 + 0.1, abs=1e-3)
+    assert [entry.memory.title for entry in everything] == [
+        "exact",
+        "near miss",
+        "exact, less important",
+    ]
@@ -0,0 +1,528 @@
+"""
+Test suite for the prediction engine.
+Tests device status prediction and scenario helpers.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from consciousness.core.prediction_engine import (
+    PredictionEngine,
+    SensorSeries,
+    _confidence_stats,
+    _sensor_stats,
+)
+
+
+def _action(device_id, hours_ago, status="completed"):
+    return SimpleNamespace(
+        device_id=device_id,
+        status=status,
+        executed_at=datetime.utcnow() - timedelta(hours=hours_ago),
+    )
+
+
+@pytest.mark.asyncio
+async def test_predict_device_status_groups_actions_once_per_window():
+    """Test device predictors see only their own actions and reuse the grouping."""
+    engine = PredictionEngine(AsyncMock())
+    devices = [
+        SimpleNamespace(id=1, user_name="Lamp"),
+        SimpleNamespace(id=2, user_name="Fan"),
+    ]
+    actions = [_action(1, 20 - i, "failed" if i % 2 else "completed") for i in range(4)]
+    actions.append(_action(2, 1))
+    engine._get_all_devices = AsyncMock(return_value=devices)
+    engine._get_recent_control_actions = AsyncMock(return_value=actions)
+
+    config = engine.prediction_types["device_status"]
+    result = await engine._predict_device_status(config)
+    await engine._predict_device_status(config)
+
+    engine._get_recent_control_actions.assert_awaited_once_with(hours=72)
+    assert [p["device_id"] for p in result["predictions"]] == [1]
+    assert result["predictions"][0]["current_success_rate"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_generate_predictions_runs_types_concurrently_with_sessionmaker():
+    """Test type predictions overlap and a failing type is skipped in order."""
+    engine = PredictionEngine(AsyncMock(), sessionmaker=MagicMock())
+    engine._queue_prediction_memory = MagicMock()
+    engine._generate_scenario_predictions = AsyncMock(return_value=[])
+    engine._update_accuracy_metrics = AsyncMock()
+    running = []
+
+    async def generate(prediction_type, config):
+        running.append(prediction_type)
+        await asyncio.sleep(0)
+        # Every type has started before any of them finishes
+        assert len(running) == len(engine.prediction_types)
+        if prediction_type == "environmental":
+            raise RuntimeError("sensor query failed")
+        return {"prediction_id": prediction_type, "confidence": 0.9}
+
+    engine._generate_type_prediction = generate
+
+    predictions = await engine.generate_predictions()
+
+    assert [p["prediction_id"] for p in predictions] == [
+        "user_behavior",
+        "system_performance",
+        "device_status",
+        "emotional_state",
+    ]
+    assert engine._queue_prediction_memory.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_recent_event_helpers_share_one_windowed_fetch():
+    """Test user and system events are filtered from a single cached query."""
+    mock_session = AsyncMock()
+    engine = PredictionEngine(mock_session)
+    now = datetime.utcnow()
+    events = [
+        SimpleNamespace(event_type="user_query", created_at=now - timedelta(days=3)),
+        SimpleNamespace(
+            event_type="system_status", created_at=now - timedelta(hours=30)
+        ),
+        SimpleNamespace(
+            event_type="resource_usage", created_at=now - timedelta(hours=2)
+        ),
+        SimpleNamespace(event_type="user_query", created_at=now - timedelta(hours=1)),
+    ]
+    result = MagicMock()
+    result.all.return_value = events
+    mock_session.execute.return_value = result
+
+    interactions = await engine._get_recent_user_interactions(days=2)
+    system_events = await engine._get_recent_system_events(hours=24)
+
+    mock_session.execute.assert_awaited_once()
+    assert interactions == [events[3]]
+    assert system_events == [events[2]]
+
+
+@pytest.mark.asyncio
+async def test_analyze_hourly_patterns_counts_hours_in_first_seen_order():
+    """Test the hour histogram keeps the order hours first appear in."""
+    engine = PredictionEngine(AsyncMock())
+    hours = [14, 9, 14, 23, 9, 14]
+    interactions = [
+        SimpleNamespace(created_at=datetime(2024, 3, 9, hour, 5)) for hour in hours
+    ]
+
+    patterns = await engine._analyze_hourly_patterns(interactions)
+
+    assert list(patterns.items()) == [(14, 3), (9, 2), (23, 1)]
+    assert await engine._analyze_hourly_patterns(interactions[:4]) is None
+
+
+@pytest.mark.asyncio
+async def test_recent_sensor_series_streams_readings_into_columns():
+    """Test streamed rows become per-type values and offsets in reading order."""
+    mock_session = AsyncMock()
+    engine = PredictionEngine(mock_session)
+    start = datetime(2024, 3, 9, 12, 0)
+    batches = [
+        [("temperature", 20.0, start), ("humidity", 40.0, start)],
+        [("temperature", 21.5, start + timedelta(seconds=90))],
+    ]
+
+    async def partitions():
+        for batch in batches:
+            yield batch
+
+    stream = MagicMock()
+    stream.partitions.return_value = partitions()
+    mock_session.stream.return_value = stream
+
+    groups = await engine._get_recent_sensor_series(hours=48)
+
+    mock_session.stream.assert_awaited_once()
+    assert list(groups) == ["temperature", "humidity"]
+    assert groups["temperature"].values.tolist() == [20.0, 21.5]
+    assert groups["temperature"].offsets.tolist() == [0.0, 90.0]
+    assert len(groups["humidity"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_compound_scenario_stats_match_numpy():
+    """Test the fused confidence statistics agree with the NumPy formulas."""
+    engine = PredictionEngine(AsyncMock())
+    confidences = [0.9, 0.8, 0.65]
+    predictions = [
+        {"prediction_id": str(i), "prediction_type": "environmental", "confidence": c}
+        for i, c in enumerate(confidences)
+    ]
+
+    scenario = await engine._generate_compound_scenario(predictions)
+
+    assert scenario["likelihood"] == pytest.approx(np.prod(confidences) ** (1 / 3))
+    assert scenario["confidence"] == pytest.approx(0.65 * 0.7)
+    assert scenario["complexity_score"] == pytest.approx(0.6 + np.std(confidences))
+
+
+@pytest.mark.asyncio
+async def test_scenario_predictions_only_build_interacting_pairs():
+    """Test weakly interacting pairs are dropped before building a scenario."""
+    engine = PredictionEngine(AsyncMock())
+    engine._generate_interaction_scenario = AsyncMock(
+        wraps=engine._generate_interaction_scenario
+    )
+    predictions = [
+        {"prediction_id": t, "prediction_type": t, "confidence": 0.9}
+        for t in ["user_behavior", "environmental", "emotional_state"]
+    ]
+
+    scenarios = await engine._generate_scenario_predictions(predictions)
+
+    built = [
+        [pred["prediction_type"] for pred in call.args[:2]]
+        for call in engine._generate_interaction_scenario.await_args_list
+    ]
+    assert built == [
+        ["user_behavior", "emotional_state"],
+        ["environmental", "emotional_state"],
+    ]
+    assert engine._calculate_interaction_strength(
+        predictions[2], predictions[0]
+    ) == pytest.approx(0.8 * 0.9)
+    assert [s["prediction_type"] for s in scenarios] == [
+        "interaction_scenario",
+        "interaction_scenario",
+        "compound_scenario",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_generate_type_prediction_dispatches_by_type():
+    """Test each type resolves to its predictor and unknown types are skipped."""
+    engine = PredictionEngine(AsyncMock())
+    engine._type_predictors["emotional_state"] = AsyncMock(
+        return_value={"confidence": 0.7, "predictions": ["calm"]}
+    )
+    config = engine.prediction_types["emotional_state"]
+
+    prediction = await engine._generate_type_prediction("emotional_state", config)
+
+    engine._type_predictors["emotional_state"].assert_awaited_once_with(config)
+    assert prediction["predictions"] == ["calm"]
+    assert await engine._generate_type_prediction("weather", config) is None
+
+
+def test_new_prediction_ids_are_unique_within_an_instant():
+    """Test ids issued back to back never collide."""
+    engine = PredictionEngine(AsyncMock())
+
+    ids = [engine._new_prediction_id("scenario") for _ in range(100)]
+
+    assert len(set(ids)) == 100
+    assert all(prediction_id.startswith("scenario_") for prediction_id in ids)
+
+
+@pytest.mark.asyncio
+async def test_generate_predictions_reuses_results_within_update_frequency():
+    """Test fresh type results are reused and stale ones are predicted again."""
+    mock_session = MagicMock()
+    mock_session.commit = AsyncMock()
+    engine = PredictionEngine(mock_session)
+    engine._generate_scenario_predictions = AsyncMock(return_value=[])
+    engine._update_accuracy_metrics = AsyncMock()
+    engine._generate_type_prediction = AsyncMock(
+        side_effect=lambda prediction_type, config: {
+            "prediction_id": prediction_type,
+            "prediction_type": prediction_type,
+            "confidence": 0.9 if prediction_type != "environmental" else 0.2,
+        }
+    )
+
+    first = await engine.generate_predictions()
+    second = await engine.generate_predictions()
+
+    assert engine._generate_type_prediction.await_count == 5
+    # Accepted predictions are stored together, and only when freshly made
+    mock_session.add_all.assert_called_once()
+    memories = mock_session.add_all.call_args.args[0]
+    assert [memory.content["prediction_id"] for memory in memories] == [
+        "user_behavior",
+        "system_performance",
+        "device_status",
+        "emotional_state",
+    ]
+    mock_session.commit.assert_awaited_once()
+    assert second == first
+
+    # Age every result past its update frequency
+    for prediction_type, (run_at, result) in engine._type_results.items():
+        engine._type_results[prediction_type] = (run_at - timedelta(days=1), result)
+    await engine.generate_predictions()
+    assert engine._generate_type_prediction.await_count == 10
+
+
+def test_event_prediction_confidence_matches_numpy_reductions():
+    """Test small-list float arithmetic agrees with the NumPy reductions."""
+    engine = PredictionEngine(AsyncMock())
+    estimates = [0.42, 0.7, 0.55]
+
+    confidence = engine._calculate_event_prediction_confidence(
+        {}, [object()] * 4, estimates
+    )
+
+    factors = [0.4, 1.0 - np.std(estimates), min(1.0, np.mean(estimates) * 2)]
+    assert confidence == pytest.approx(np.mean(factors))
+
+
+def test_event_estimators_share_one_clock_reading():
+    """Test trend and timing estimates use the given time, not the clock."""
+    engine = PredictionEngine(AsyncMock())
+    now = datetime(2024, 3, 9, 12, 0)
+    historical_data = [
+        SimpleNamespace(created_at=now - timedelta(days=days))
+        for days in [20, 10, 5, 2, 1]
+    ]
+
+    avg_interval = engine._average_event_interval(historical_data)
+
+    assert avg_interval == timedelta(days=19 / 4).total_seconds()
+    # Three of five events fall in the last week
+    assert engine._calculate_trend_probability(historical_data, now) == pytest.approx(
+        3 / 7 / 2 * 0.5
+    )
+    assert engine._predict_event_timing(
+        historical_data, avg_interval, timedelta(days=4), now
+    ) == now - timedelta(days=1) + timedelta(days=19 / 4)
+    assert (
+        engine._predict_event_timing(
+            historical_data, avg_interval, timedelta(hours=6), now
+        )
+        is None
+    )
+
+
+def test_temporal_probability_handles_back_to_back_events():
+    """Test a zero average interval gives the capped probability, not an error."""
+    engine = PredictionEngine(AsyncMock())
+    now = datetime(2024, 3, 9, 12, 0)
+    historical_data = [SimpleNamespace(created_at=now - timedelta(hours=1))] * 4
+
+    assert engine._calculate_temporal_probability(historical_data, 0.0, now) == 0.9
+
+
+@pytest.mark.asyncio
+async def test_specific_event_prediction_with_shared_timestamps():
+    """Test events sharing one timestamp get a positive interval and a timing."""
+    engine = PredictionEngine(AsyncMock())
+    created_at = datetime.utcnow() - timedelta(hours=1)
+    historical_data = [SimpleNamespace(created_at=created_at, event_data={})] * 4
+    engine._get_historical_event_data = AsyncMock(return_value=historical_data)
+
+    avg_interval = engine._average_event_interval(historical_data)
+    prediction = await engine.predict_specific_event("motion")
+
+    assert avg_interval == timedelta(microseconds=1).total_seconds()
+    assert prediction["probability"] == pytest.approx((0.9 + 0.5 + 0.5) / 3)
+    assert (
+        prediction["predicted_time"]
+        == (created_at + timedelta(microseconds=1)).isoformat()
+    )
+
+
+def test_confidence_stats_geometric_mean_does_not_underflow():
+    """Test many small confidences keep a meaningful geometric mean."""
+    assert _confidence_stats([0.5] * 2000) == (pytest.approx(0.5), 0.5, 0.0)
+    assert _confidence_stats([0.0, 0.8])[0] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_sensor_trend_matches_polyfit():
+    """Test the closed-form slope and R-squared agree with np.polyfit."""
+    engine = PredictionEngine(AsyncMock())
+    offsets = np.array([0.0, 60.0, 150.0, 200.0, 330.0, 400.0])
+    values = np.array([20.0, 20.4, 21.1, 21.0, 22.3, 22.2])
+    horizon = timedelta(hours=1)
+
+    trend = await engine._predict_sensor_trend(
+        "temperature", SensorSeries(values, offsets), _sensor_stats(values), horizon
+    )
+
+    slope = np.polyfit(offsets, values, 1)[0]
+    ss_res = np.sum((values - (values[0] + slope * offsets)) ** 2)
+    ss_tot = np.sum((values - values.mean()) ** 2)
+    assert trend["predicted_value"] == pytest.approx(22.2 + slope * 3600)
+    assert trend["confidence"] == pytest.approx(max(0.1, min(0.9, 1 - ss_res / ss_tot)))
+    assert trend["trend_direction"] == "increasing"
+
+
+@pytest.mark.asyncio
+async def test_user_satisfaction_compares_recent_and_older_averages():
+    """Test the satisfaction trend compares plain float averages."""
+    engine = PredictionEngine(AsyncMock())
+    now = datetime(2024, 3, 9, 12, 0)
+    scores = [0.9, 0.8, 0.5, 0.6, 0.5, 0.4, 0.6]
+    interactions = [
+        SimpleNamespace(event_data={"satisfaction": score}, created_at=now)
+        for score in scores
+    ]
+    interactions.insert(3, SimpleNamespace(event_data=None, created_at=now))
+
+    prediction = await engine._predict_user_satisfaction(interactions)
+
+    assert prediction["current_level"] == pytest.approx(np.mean(scores[-5:]))
+    assert prediction["trend"] == "declining"
+    assert prediction["confidence"] == pytest.approx(0.7)
+
+
+@pytest.mark.asyncio
+async def test_gather_reads_overlaps_only_with_sessionmaker():
+    """Test independent reads overlap on own sessions and run in turn otherwise."""
+    for sessionmaker, expected in [
+        (MagicMock(), ["start a", "start b", "end a", "end b"]),
+        (None, ["start a", "end a", "start b", "end b"]),
+    ]:
+        engine = PredictionEngine(AsyncMock(), sessionmaker=sessionmaker)
+        steps = []
+
+        async def read(name):
+            steps.append(f"start {name}")
+            await asyncio.sleep(0)
+            steps.append(f"end {name}")
+            return name
+
+        assert await engine._gather_reads(read("a"), read("b")) == ["a", "b"]
+        assert steps == expected
+
+
+@pytest.mark.asyncio
+async def test_emotional_predictions_match_per_emotion_numpy():
+    """Test the shared emotion matrix gives per-emotion polyfit slopes and stds."""
+    engine = PredictionEngine(AsyncMock())
+    rows = [
+        (0.5, 0.2, 0.4, 0.3),
+        (0.55, 0.25, 0.4, 0.2),
+        (0.6, 0.2, 0.35, 0.4),
+        (0.7, 0.3, 0.4, 0.1),
+        (0.72, 0.2, 0.3, 0.3),
+        (0.8, 0.25, 0.3, 0.2),
+    ]
+    emotions = ["happiness", "worry", "boredom", "excitement"]
+    states = [
+        SimpleNamespace(trigger_event=None, **dict(zip(emotions, row))) for row in rows
+    ]
+    engine._get_emotional_state_history = AsyncMock(return_value=states)
+
+    result = await engine._predict_emotional_state(
+        engine.prediction_types["emotional_state"]
+    )
+
+    trends, stability = result["predictions"]
+    for index, emotion in enumerate(emotions):
+        column = [row[index] for row in rows]
+        slope = np.polyfit(range(len(column)), column, 1)[0]
+        trend = trends["emotion_trends"][emotion]
+        assert trend["trend_strength"] == pytest.approx(abs(slope))
+        assert trend["predicted_value"] == pytest.approx(
+            max(0, min(1, column[-1] + slope * 3))
+        )
+        assert stability["volatility_by_emotion"][emotion] == pytest.approx(
+            np.std(column)
+        )
+    assert trends["emotion_trends"]["happiness"]["trend_direction"] == "increasing"
+
+
+@pytest.mark.asyncio
+async def test_counted_patterns_pick_first_or_earliest_on_ties():
+    """Test counters keep the original tie-breaking of the peak lookups."""
+    engine = PredictionEngine(AsyncMock())
+    day = datetime(2024, 3, 9)
+    actions = [
+        SimpleNamespace(executed_at=day.replace(hour=hour))
+        for hour in [9, 7, 9, 7, 20, 20, 9, 7, 21, 22]
+    ]
+    device = SimpleNamespace(id=1, user_name="Lamp")
+
+    usage = await engine._predict_device_usage(device, actions, timedelta(hours=6))
+
+    assert (usage["peak_hour"], usage["peak_usage_count"]) == (9, 3)
+    assert usage["usage_pattern"] == {9: 3, 7: 3, 20: 2, 21: 1, 22: 1}
+
+    states = [SimpleNamespace(trigger_event=t) for t in "bab" + "a" + "c"]
+    triggers = await engine._predict_emotional_triggers(states, timedelta(hours=6))
+    assert triggers["most_likely_trigger"] == "b"
+    assert triggers["all_triggers"] == {"b": 2, "a": 2, "c": 1}
+
+    events = [SimpleNamespace(created_at=a.executed_at) for a in actions]
+    factors = engine._identify_influencing_factors("motion", events, {})
+    assert factors[0]["factor"] == "Most common at hour 7"
+
+
+@pytest.mark.asyncio
+async def test_system_bottlenecks_count_recent_activity_against_one_cutoff():
+    """Test recent actions and high-severity events use a two-hour cutoff."""
+    engine = PredictionEngine(AsyncMock())
+    now = datetime.utcnow()
+    actions = [
+        SimpleNamespace(executed_at=now - timedelta(minutes=m))
+        for m in range(0, 150, 3)
+    ]
+    events = [
+        SimpleNamespace(severity=severity, created_at=now - timedelta(hours=hours))
+        for severity, hours in [("high", 3), ("critical", 1), ("low", 1), ("high", 0.5)]
+    ]
+
+    prediction = await engine._predict_system_bottlenecks(events, actions)
+
+    # 40 actions in the last two hours is 20 an hour, under the threshold
+    assert prediction["risk_factors"] == ["2 recent high-severity events"]
+    assert prediction["risk_level"] == pytest.approx(0.4)
+
+
+@pytest.mark.asyncio
+async def test_resource_usage_reads_each_metric_once_per_event():
+    """Test CPU and memory series skip events without the metric."""
+    engine = PredictionEngine(AsyncMock())
+    samples = [
+        {"cpu_percent": 10, "memory_percent": 40},
+        {"cpu_percent": 20},
+        None,
+        {"memory_percent": 50, "cpu_percent": None},
+        {"cpu_percent": 30, "memory_percent": 45},
+        {"cpu_percent": 35, "memory_percent": 55},
+        {"cpu_percent": 40},
+        {"cpu_percent": 45},
+    ]
+    events = [SimpleNamespace(event_data=data) for data in samples]
+
+    prediction = await engine._predict_resource_usage(events, timedelta(hours=1))
+
+    cpu = prediction["predictions"]["cpu"]
+    assert cpu["current"] == 45
+    assert cpu["predicted"] == pytest.approx(45 + 40 - 20)
+    memory = prediction["predictions"]["memory"]
+    assert memory["current"] == 55
+    assert memory["predicted"] == pytest.approx((40 + 50 + 45 + 55) / 4)
+
+
+@pytest.mark.asyncio
+async def test_sensor_predictors_share_one_stats_pass():
+    """Test the anomaly baseline matches NumPy and both predictors get it."""
+    engine = PredictionEngine(AsyncMock())
+    values = np.array([20.0] * 8 + [20.5, 19.5] + [20.0, 20.2, 26.0, 27.0, 20.1])
+    series = SensorSeries(values, np.arange(len(values)) * 60.0)
+    engine._get_recent_sensor_series = AsyncMock(return_value={"temperature": series})
+    engine._predict_sensor_trend = AsyncMock(return_value=None)
+
+    result = await engine._predict_environmental_conditions(
+        engine.prediction_types["environmental"]
+    )
+
+    stats = engine._predict_sensor_trend.await_args.args[2]
+    assert stats.mean == pytest.approx(np.mean(values))
+    assert stats.std == pytest.approx(np.std(values))
+    (anomaly,) = result["predictions"]
+    assert anomaly["baseline_std"] == pytest.approx(np.std(values))
+    assert anomaly["recent_anomalies"] == 2